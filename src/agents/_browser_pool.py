@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Shared Playwright browser pool for portal agents
+"""
+
+import atexit
+import logging
+import threading
+
+from playwright.sync_api import sync_playwright, BrowserContext
+
+
+class BrowserPool:
+    """Process-wide Chromium instance that lends isolated contexts to agents
+
+    Launching Chromium costs seconds; a daily run across several portal
+    agents only needs one browser. Each agent gets its own context so
+    cookies and storage stay isolated per portal.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._playwright = None
+        self._browser = None
+        self._contexts_served = 0
+        # Persistent contexts keyed by profile dir, kept open across runs
+        self._persistent_contexts = {}
+
+    @classmethod
+    def instance(cls) -> "BrowserPool":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    # Keep long-running daemon memory bounded: default Chromium caches grow
+    # unbounded and its JS heap is sized for desktop machines
+    LAUNCH_ARGS = [
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--disable-background-networking',
+        '--disable-background-timer-throttling',
+        '--disable-renderer-backgrounding',
+        '--disable-features=TranslateUI,BackForwardCache',
+        '--js-flags=--max-old-space-size=512',
+        '--memory-pressure-off',
+    ]
+
+    # Recycle the browser after this many contexts to shed accumulated RSS
+    MAX_CONTEXTS_PER_BROWSER = 50
+
+    def _ensure_browser(self, headless: bool = True):
+        if self._browser is not None and self._contexts_served >= self.MAX_CONTEXTS_PER_BROWSER:
+            self.logger.info("Recycling shared Chromium after %d contexts", self._contexts_served)
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=headless,
+                args=self.LAUNCH_ARGS
+            )
+            self._contexts_served = 0
+            self.logger.info("Shared Chromium browser started")
+        return self._browser
+
+    def acquire_context(self, headless: bool = True, **context_kwargs) -> BrowserContext:
+        """Create an isolated BrowserContext on the shared browser"""
+        with self._lock:
+            # A modest viewport avoids the default 1280x720+ raster buffers
+            context_kwargs.setdefault('viewport', {'width': 1280, 'height': 800})
+            context = self._ensure_browser(headless).new_context(**context_kwargs)
+            self._contexts_served += 1
+            return context
+
+    def acquire_persistent_context(self, user_data_dir: str, headless: bool = True, **context_kwargs) -> BrowserContext:
+        """Launch (or reuse) a context backed by an on-disk Chromium profile
+
+        Unlike acquire_context, the profile's cookies and HTTP disk cache
+        survive process restarts, so repeat visits to the same portal hit
+        a warm cache. The context stays open until shutdown.
+        """
+        with self._lock:
+            context = self._persistent_contexts.get(user_data_dir)
+            if context is not None:
+                try:
+                    # Liveness probe: raises once the context is closed
+                    _ = context.pages
+                    return context
+                except Exception:
+                    del self._persistent_contexts[user_data_dir]
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            context_kwargs.setdefault('viewport', {'width': 1280, 'height': 800})
+            context = self._playwright.chromium.launch_persistent_context(
+                user_data_dir,
+                headless=headless,
+                args=self.LAUNCH_ARGS,
+                **context_kwargs
+            )
+            self._persistent_contexts[user_data_dir] = context
+            self.logger.info("Persistent Chromium context started for %s", user_data_dir)
+            return context
+
+    @classmethod
+    def shutdown(cls):
+        """Close the shared browser; registered via atexit"""
+        pool = cls._instance
+        if pool is None:
+            return
+        try:
+            for context in pool._persistent_contexts.values():
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            pool._persistent_contexts.clear()
+            if pool._browser:
+                pool._browser.close()
+            if pool._playwright:
+                pool._playwright.stop()
+        except Exception:
+            pass
+        pool._browser = None
+        pool._playwright = None
+        cls._instance = None
+
+
+atexit.register(BrowserPool.shutdown)
@@ -0,0 +1,38 @@
+"""
+Shared in-browser DOM probes for the Playwright agents
+"""
+
+# Resolves every candidate selector in one page.evaluate instead of one
+# protocol round-trip per selector, and unlike a union locator it
+# preserves the priority order of the candidate list. The Playwright-only
+# :has-text() and text= forms are handled with a text scan in the browser.
+_FIND_FIRST_VISIBLE_JS = """
+    (sels) => {
+        const visible = (e) => !!(e && e.getClientRects().length);
+        return sels.findIndex((s) => {
+            try {
+                const ht = s.match(/^([a-z]+):has-text\\("(.+)"\\)$/i);
+                if (ht) {
+                    return [...document.querySelectorAll(ht[1])]
+                        .some(e => visible(e) && e.textContent.includes(ht[2]));
+                }
+                const tx = s.match(/^text="(.+)"$/);
+                if (tx) {
+                    return [...document.querySelectorAll('a, button, span, div, h1, h2, h3')]
+                        .some(e => visible(e) && e.textContent.trim() === tx[1]);
+                }
+                return visible(document.querySelector(s));
+            } catch {
+                return false;
+            }
+        });
+    }
+"""
+
+
+def find_first_visible(page, selectors) -> int:
+    """Return the index of the first visible match on page, or -1"""
+    try:
+        return page.evaluate(_FIND_FIRST_VISIBLE_JS, list(selectors))
+    except Exception:
+        return -1
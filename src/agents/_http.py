@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Process-wide HTTP session shared by the portal agents
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Browser-like headers applied once when the shared session is built
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Exception types meaning "the network failed", for either backend;
+# anything else is a programming error and should propagate
+NETWORK_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+_SESSION = None
+_LOCK = threading.Lock()
+
+
+def _build_session():
+    """Build the process-wide client, preferring HTTP/2 when available
+
+    With httpx (and its h2 extra) installed, requests to a given host
+    multiplex over a single TLS connection; otherwise a requests session
+    with a generously sized keep-alive pool and transient-error retries
+    serves all agents.
+    """
+    if httpx is not None:
+        try:
+            client = httpx.Client(
+                http2=True,
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=64)
+            )
+            client.headers.update(DEFAULT_HEADERS)
+            return client
+        except ImportError:
+            # httpx present but the h2 extra is not
+            pass
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504]
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session():
+    """Return the shared HTTP client, creating it on first use
+
+    One pool across all portal agents means fewer idle keep-alive
+    sockets and a single place to tune retry and pooling policy.
+    """
+    global _SESSION
+    with _LOCK:
+        if _SESSION is None:
+            _SESSION = _build_session()
+        return _SESSION
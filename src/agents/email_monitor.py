@@ -4,6 +4,8 @@ Email Monitor Agent - Monitors email responses and tracks application status
 
 import time
 import logging
+import queue
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import imaplib
@@ -12,7 +14,7 @@ import re
 
 from ..core.config import config
 from ..core.database import db
-from ..core.utils import setup_logging, parse_email_content, check_email_for_responses
+from ..core.utils import setup_logging, parse_email_content, IMAPClient
 
 
 class EmailMonitor:
@@ -23,7 +25,31 @@ class EmailMonitor:
         self.email_config = config.get_email_config()
         self.monitoring_interval = config.get_scheduler_config().get('email_monitoring', {}).get('interval', 30)
         self.response_patterns = self._load_response_patterns()
-    
+        self._imap_client = IMAPClient(self.email_config)
+
+        # Background writer keeps DB inserts off the email analysis path
+        self._task_queue = queue.Queue(maxsize=1024)
+        self._writer = threading.Thread(target=self._db_writer, daemon=True)
+        self._writer.start()
+
+    def _db_writer(self):
+        """Drain queued scheduled tasks and insert them in batches"""
+        while True:
+            tasks = [self._task_queue.get()]
+            while len(tasks) < 256:
+                try:
+                    tasks.append(self._task_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                db.add_scheduled_tasks(tasks)
+            except Exception as e:
+                self.logger.error(f"Error writing scheduled tasks: {e}")
+
+            for _ in tasks:
+                self._task_queue.task_done()
+
     def _load_response_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Load patterns for identifying different types of email responses"""
         patterns = {
@@ -60,8 +86,8 @@ class EmailMonitor:
         self.logger.info("Starting email response monitoring")
         
         try:
-            # Check for new emails
-            new_responses = check_email_for_responses(self.email_config)
+            # Check for new emails on the persistent connection
+            new_responses = self._imap_client.check_for_responses()
             
             for response in new_responses:
                 try:
@@ -340,15 +366,15 @@ class EmailMonitor:
             # This would require additional database methods to find applications by email
             # For now, we'll log the status update
             self.logger.info(f"Application status updated to: {status}")
-            
-            # Add to scheduled tasks for tracking
-            db.add_scheduled_task(
-                task_name=f"status_update_{status}",
-                task_type="application_status",
-                schedule_time=datetime.now().strftime("%H:%M"),
-                config={"status": status, "details": details, "sender": sender}
-            )
-            
+
+            # Queue the tracking task; the writer thread handles the insert
+            self._task_queue.put_nowait({
+                "task_name": f"status_update_{status}",
+                "task_type": "application_status",
+                "schedule_time": datetime.now().strftime("%H:%M"),
+                "config": {"status": status, "details": details, "sender": sender}
+            })
+
         except Exception as e:
             self.logger.error(f"Error updating application status: {e}")
     
@@ -421,6 +447,7 @@ class EmailMonitor:
                 
             except KeyboardInterrupt:
                 self.logger.info("Email monitoring stopped by user")
+                self._imap_client.logout()
                 break
             except Exception as e:
                 self.logger.error(f"Error in continuous monitoring: {e}")
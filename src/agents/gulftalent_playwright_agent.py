@@ -3,12 +3,73 @@
 GulfTalent.com UAE Automation Agent using Playwright
 """
 
-import json
+import os
+import re
 import time
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from playwright.sync_api import Page
+from playwright.sync_api import Error as PWError, TimeoutError as PWTimeout
+
+from ..core.portal_config import get_portal_config
+from ._browser_pool import BrowserPool
+from ._dom import find_first_visible
+
+# Selector alternatives unioned into single locators so each probe is one
+# DOM query instead of one round-trip per candidate
+LOGIN_SELECTORS = (
+    'a:has-text("Login")',
+    'a:has-text("Sign In")',
+    'button:has-text("Login")',
+    'button:has-text("Sign In")',
+    '.login-btn',
+    '#login-btn',
+    '[data-testid="login"]'
+)
+USER_MENU_SELECTORS = (
+    '.user-menu',
+    '.profile-menu',
+    '[data-testid="user-menu"]',
+    '.dropdown-menu',
+    '.user-dropdown'
+)
+RESUME_SELECTORS = (
+    'text="Resume"',
+    'text="CV"',
+    '[data-testid="resume"]',
+    '.resume',
+    '#resume',
+    'a:has-text("Resume")',
+    'a:has-text("CV")'
+)
+REFRESH_SELECTORS = (
+    'button:has-text("Refresh")',
+    'button:has-text("Update")',
+    'a:has-text("Refresh CV")',
+    'a:has-text("Update CV")',
+    'button:has-text("Edit")',
+    'a:has-text("Edit")'
+)
+UPDATE_SELECTORS = (
+    'button:has-text("Update")',
+    'button:has-text("Save")',
+    'button:has-text("Refresh")'
+)
+PROFILE_URLS = (
+    "https://www.gulftalent.com/profile",
+    "https://www.gulftalent.com/dashboard",
+    "https://www.gulftalent.com/my-profile",
+    "https://www.gulftalent.com/account"
+)
+
+LOGOUT_REGEX = re.compile(r'Logout|Sign Out', re.I)
+
+# Persisted auth state lets warm runs skip the login flow entirely
+STATE_PATH = ".cache/gulftalent_state.json"
+STATE_MAX_AGE = 24 * 60 * 60
+
+LOGIN_UNION = ", ".join(LOGIN_SELECTORS)
 
 class GulfTalentPlaywrightAgent:
     """GulfTalent.com UAE automation agent using Playwright"""
@@ -19,16 +80,16 @@ class GulfTalentPlaywrightAgent:
         self.context = None
         self.page = None
         self.credentials = None
+        self._locator_cache: Dict[str, Any] = {}
         self._load_config()
     
     def _load_config(self):
         """Load GulfTalent.com configuration from job_portals.json"""
         try:
-            with open('src/data/job_portals.json', 'r') as f:
-                portals = json.load(f)
-                gulftalent_config = portals.get('gulftalent', {})
-                self.credentials = gulftalent_config.get('credentials', {})
-                self.logger.info("GulfTalent.com configuration loaded successfully")
+            portals = get_portal_config()
+            gulftalent_config = portals.get('gulftalent', {})
+            self.credentials = gulftalent_config.get('credentials', {})
+            self.logger.info("GulfTalent.com configuration loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading GulfTalent.com configuration: {e}")
             self.credentials = {
@@ -36,24 +97,91 @@ class GulfTalentPlaywrightAgent:
                 "password": "Miral@123"
             }
     
+    def _loc(self, selector: str):
+        """Return a cached locator for the current page, building it once"""
+        locator = self._locator_cache.get(selector)
+        if locator is None:
+            locator = self.page.locator(selector)
+            self._locator_cache[selector] = locator
+        return locator
+
     def start_browser(self, headless: bool = True):
         """Start Playwright browser"""
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
+            storage_state = None
+            try:
+                if os.path.exists(STATE_PATH) and time.time() - os.path.getmtime(STATE_PATH) < STATE_MAX_AGE:
+                    storage_state = STATE_PATH
+            except OSError:
+                pass
+            self.context = BrowserPool.instance().acquire_context(
                 headless=headless,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                storage_state=storage_state
             )
-            self.context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            # Block heavy resources the agent never inspects; stylesheets
+            # stay because visibility checks depend on computed layout
+            self.context.route(
+                "**/*",
+                lambda route: route.abort()
+                if route.request.resource_type in {"image", "font", "media"}
+                else route.continue_()
             )
+            # Track in-flight fetch/XHR so waits can key off real network
+            # quiescence instead of fixed sleeps
+            self.context.add_init_script("""
+                window.__inflight = 0;
+                window.__lastIdle = performance.now();
+                const track = (promise) => {
+                    window.__inflight++;
+                    return promise.finally(() => {
+                        if (--window.__inflight === 0) window.__lastIdle = performance.now();
+                    });
+                };
+                const origFetch = window.fetch;
+                window.fetch = function() { return track(origFetch.apply(this, arguments)); };
+                const origSend = XMLHttpRequest.prototype.send;
+                XMLHttpRequest.prototype.send = function() {
+                    window.__inflight++;
+                    this.addEventListener('loadend', () => {
+                        if (--window.__inflight === 0) window.__lastIdle = performance.now();
+                    });
+                    return origSend.apply(this, arguments);
+                };
+            """)
+            # Bound every action so one stuck selector cannot stall a run;
+            # set at context level so pages opened later (e.g. the raced
+            # profile pages) inherit the same bounds
+            self.context.set_default_timeout(5000)
+            self.context.set_default_navigation_timeout(15000)
             self.page = self.context.new_page()
+            self._locator_cache.clear()
             self.logger.info("GulfTalent.com browser started successfully")
             return True
         except Exception as e:
             self.logger.error(f"Error starting GulfTalent.com browser: {e}")
             return False
     
+    def _save_storage_state(self):
+        """Persist cookies/localStorage so the next run can skip login"""
+        try:
+            os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+            self.context.storage_state(path=STATE_PATH)
+        except Exception as e:
+            self.logger.warning(f"Could not save auth state: {e}")
+
+    def _wait_idle(self, idle_ms: int = 500, timeout: int = 8000):
+        """Wait until no fetch/XHR has been in flight for idle_ms"""
+        try:
+            self.page.wait_for_function(
+                f"() => window.__inflight === 0 && (performance.now() - window.__lastIdle) > {idle_ms}",
+                timeout=timeout
+            )
+        except Exception:
+            # The hook may be absent (page loaded before start_browser
+            # installed it) or the page may simply never settle; proceed
+            pass
+
     def login(self) -> bool:
         """Login to GulfTalent.com"""
         try:
@@ -62,39 +190,27 @@ class GulfTalentPlaywrightAgent:
                     return False
             
             # Navigate to GulfTalent.com UAE
-            self.page.goto("https://www.gulftalent.com", wait_until='networkidle')
-            time.sleep(3)
+            self.page.goto("https://www.gulftalent.com", wait_until='domcontentloaded')
+            self._locator_cache.clear()
+            self._wait_idle()
             
             # Check if already logged in
             if self._is_logged_in():
                 self.logger.info("Already logged in to GulfTalent.com")
+                self._save_storage_state()
                 return True
             
             # Click on Login button
             try:
-                login_selectors = [
-                    'a:has-text("Login")',
-                    'a:has-text("Sign In")',
-                    'button:has-text("Login")',
-                    'button:has-text("Sign In")',
-                    '.login-btn',
-                    '#login-btn',
-                    '[data-testid="login"]'
-                ]
-                
-                login_button = None
-                for selector in login_selectors:
-                    try:
-                        login_button = self.page.locator(selector)
-                        if login_button.is_visible():
-                            self.logger.info(f"Found login button: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if login_button and login_button.is_visible():
+                login_button = self._loc(LOGIN_UNION).first
+                try:
+                    login_button.wait_for(state='visible', timeout=3000)
+                except Exception:
+                    login_button = None
+
+                if login_button:
                     login_button.click()
-                    time.sleep(3)
+                    self._wait_idle()
                 else:
                     self.logger.error("Could not find login button")
                     return False
@@ -102,83 +218,41 @@ class GulfTalentPlaywrightAgent:
                 self.logger.error(f"Error clicking login: {e}")
                 return False
             
-            # Fill login form
+            # Fill login form via the accessibility tree, with a CSS fallback
             try:
-                # Try multiple selectors for email field
-                email_selectors = [
-                    'input[name="email"]',
-                    'input[type="email"]',
-                    'input[placeholder*="email"]',
-                    'input[placeholder*="Email"]',
-                    'input[id*="email"]',
-                    'input[name*="username"]',
-                    'input[name*="user"]'
-                ]
-                
-                email_field = None
-                for selector in email_selectors:
-                    try:
-                        email_field = self.page.locator(selector)
-                        if email_field.is_visible():
-                            self.logger.info(f"Found email field: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if not email_field or not email_field.is_visible():
+                email_field = self.page.get_by_role(
+                    "textbox", name=re.compile("email|user", re.I)
+                ).or_(self.page.locator('input[type="email"], input[name="email"]')).first
+                try:
+                    email_field.wait_for(state='visible', timeout=3000)
+                except Exception:
                     self.logger.error("Could not find email field")
                     return False
-                
-                # Try multiple selectors for password field
-                password_selectors = [
-                    'input[name="password"]',
-                    'input[type="password"]',
-                    'input[placeholder*="password"]',
-                    'input[placeholder*="Password"]',
-                    'input[id*="password"]'
-                ]
-                
-                password_field = None
-                for selector in password_selectors:
-                    try:
-                        password_field = self.page.locator(selector)
-                        if password_field.is_visible():
-                            self.logger.info(f"Found password field: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if not password_field or not password_field.is_visible():
+
+                # type="password" is unambiguous; no role lookup needed
+                password_field = self.page.locator('input[type="password"]').first
+                try:
+                    password_field.wait_for(state='visible', timeout=3000)
+                except Exception:
                     self.logger.error("Could not find password field")
                     return False
-                
+
                 # Fill credentials
                 email_field.fill(self.credentials['username'])
                 password_field.fill(self.credentials['password'])
-                
+
                 # Click submit button
-                submit_selectors = [
-                    'button[type="submit"]',
-                    'button:has-text("Login")',
-                    'button:has-text("Sign In")',
-                    'input[type="submit"]',
-                    '.submit-btn',
-                    '#submit-btn'
-                ]
-                
-                submit_button = None
-                for selector in submit_selectors:
-                    try:
-                        submit_button = self.page.locator(selector)
-                        if submit_button.is_visible():
-                            self.logger.info(f"Found submit button: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if submit_button and submit_button.is_visible():
+                submit_button = self.page.get_by_role(
+                    "button", name=re.compile("sign in|login", re.I)
+                ).or_(self.page.locator('button[type="submit"], input[type="submit"]')).first
+                try:
+                    submit_button.wait_for(state='visible', timeout=3000)
+                except Exception:
+                    submit_button = None
+
+                if submit_button:
                     submit_button.click()
-                    time.sleep(5)
+                    self._wait_idle(timeout=15000)
                 else:
                     self.logger.error("Could not find submit button")
                     return False
@@ -186,6 +260,7 @@ class GulfTalentPlaywrightAgent:
                 # Check if login was successful
                 if self._is_logged_in():
                     self.logger.info("Successfully logged in to GulfTalent.com")
+                    self._save_storage_state()
                     return True
                 else:
                     self.logger.error("Login failed - not logged in")
@@ -200,48 +275,24 @@ class GulfTalentPlaywrightAgent:
             return False
     
     def _is_logged_in(self) -> bool:
-        """Check if user is logged in to GulfTalent.com"""
+        """Check if user is logged in to GulfTalent.com
+
+        One evaluate answers the URL check, the user-menu probe and the
+        logout-link text scan in a single round-trip
+        """
         try:
-            # Check for logged in indicators
-            current_url = self.page.url
-            if "dashboard" in current_url or "profile" in current_url:
-                return True
-            
-            # Check for user menu or profile elements
-            user_menu_selectors = [
-                '.user-menu',
-                '.profile-menu',
-                '[data-testid="user-menu"]',
-                '.dropdown-menu',
-                '.user-dropdown'
-            ]
-            
-            for selector in user_menu_selectors:
-                try:
-                    user_menu = self.page.locator(selector)
-                    if user_menu.is_visible():
-                        return True
-                except:
-                    continue
-            
-            # Check for logout option
-            logout_selectors = [
-                'a:has-text("Logout")',
-                'a:has-text("Sign Out")',
-                'button:has-text("Logout")',
-                'button:has-text("Sign Out")'
-            ]
-            
-            for selector in logout_selectors:
-                try:
-                    logout = self.page.locator(selector)
-                    if logout.is_visible():
-                        return True
-                except:
-                    continue
-            
-            return False
-        except:
+            return bool(self.page.evaluate("""
+                (sels) => {
+                    if (/dashboard|profile/.test(location.href)) return true;
+                    const visible = (e) => !!(e && e.getClientRects().length);
+                    if (sels.some(s => {
+                        try { return visible(document.querySelector(s)); } catch { return false; }
+                    })) return true;
+                    return [...document.querySelectorAll('a, button')]
+                        .some(e => visible(e) && /Logout|Sign Out/i.test(e.textContent));
+                }
+            """, list(USER_MENU_SELECTORS)))
+        except PWError:
             return False
     
     def test_connection(self) -> Dict[str, Any]:
@@ -251,7 +302,8 @@ class GulfTalentPlaywrightAgent:
                 if not self.start_browser():
                     return {"status": "error", "message": "Failed to start browser"}
             
-            self.page.goto("https://www.gulftalent.com", wait_until='networkidle')
+            # Probe-only path: the title is readable at domcontentloaded
+            self.page.goto("https://www.gulftalent.com", wait_until='domcontentloaded')
             title = self.page.title()
             
             if "GulfTalent" in title or "gulftalent" in title.lower():
@@ -280,104 +332,55 @@ class GulfTalentPlaywrightAgent:
                     return False
             
             # Navigate to profile/CV page
-            profile_urls = [
-                "https://www.gulftalent.com/profile",
-                "https://www.gulftalent.com/dashboard",
-                "https://www.gulftalent.com/my-profile",
-                "https://www.gulftalent.com/account"
-            ]
-            
-            profile_loaded = False
-            for url in profile_urls:
-                try:
-                    self.page.goto(url, wait_until='networkidle')
-                    time.sleep(3)
-                    
-                    # Check if we're on a profile page
-                    if "profile" in self.page.url or "dashboard" in self.page.url:
-                        profile_loaded = True
-                        self.logger.info(f"Successfully loaded profile page: {url}")
-                        break
-                except Exception as e:
-                    self.logger.warning(f"Failed to load {url}: {e}")
-                    continue
-            
-            if not profile_loaded:
+            winner = self._race_profile_pages(PROFILE_URLS)
+            if not winner:
                 self.logger.error("Could not load any profile page")
                 return False
+
+            # Adopt the winning page for the rest of the refresh
+            if self.page and self.page is not winner:
+                try:
+                    self.page.close()
+                except Exception:
+                    pass
+            self.page = winner
+            self._locator_cache.clear()
             
             # Look for CV refresh or update options
             try:
                 # Look for resume/CV section
-                resume_selectors = [
-                    'text="Resume"',
-                    'text="CV"',
-                    '[data-testid="resume"]',
-                    '.resume',
-                    '#resume',
-                    'a:has-text("Resume")',
-                    'a:has-text("CV")'
-                ]
-                
-                resume_found = False
-                for selector in resume_selectors:
-                    try:
-                        resume_element = self.page.locator(selector)
-                        if resume_element.is_visible():
-                            self.logger.info(f"Found resume section: {selector}")
-                            resume_found = True
-                            break
-                    except:
-                        continue
-                
+                resume_idx = find_first_visible(self.page, RESUME_SELECTORS)
+                resume_found = resume_idx >= 0
+                if resume_found:
+                    self.logger.info(f"Found resume section: {RESUME_SELECTORS[resume_idx]}")
+
                 if resume_found:
                     # Try to find refresh/update options
-                    refresh_selectors = [
-                        'button:has-text("Refresh")',
-                        'button:has-text("Update")',
-                        'a:has-text("Refresh CV")',
-                        'a:has-text("Update CV")',
-                        'button:has-text("Edit")',
-                        'a:has-text("Edit")'
-                    ]
-                    
-                    for selector in refresh_selectors:
-                        try:
-                            refresh_button = self.page.locator(selector)
-                            if refresh_button.is_visible():
-                                refresh_button.click()
-                                time.sleep(3)
-                                self.logger.info(f"Clicked refresh button: {selector}")
-                                return True
-                        except:
-                            continue
+                    refresh_idx = find_first_visible(self.page, REFRESH_SELECTORS)
+                    if refresh_idx >= 0:
+                        selector = REFRESH_SELECTORS[refresh_idx]
+                        self._loc(selector).click()
+                        self._wait_idle()
+                        self.logger.info(f"Clicked refresh button: {selector}")
+                        return True
                     
                     # If no refresh button, try to click on the resume itself
                     try:
-                        resume_click = self.page.locator('a:has-text("Resume"), a:has-text("CV")')
-                        if resume_click.is_visible():
+                        resume_click = self._loc('a:has-text("Resume"), a:has-text("CV")')
+                        if resume_click.is_visible(timeout=500):
                             resume_click.click()
-                            time.sleep(3)
+                            self._wait_idle()
                             self.logger.info("Clicked on Resume/CV")
                             
                             # Look for update options on the resume page
-                            update_selectors = [
-                                'button:has-text("Update")',
-                                'button:has-text("Save")',
-                                'button:has-text("Refresh")'
-                            ]
-                            
-                            for selector in update_selectors:
-                                try:
-                                    update_button = self.page.locator(selector)
-                                    if update_button.is_visible():
-                                        update_button.click()
-                                        time.sleep(2)
-                                        self.logger.info(f"Updated resume: {selector}")
-                                        return True
-                                except:
-                                    continue
-                    except:
+                            update_idx = find_first_visible(self.page, UPDATE_SELECTORS)
+                            if update_idx >= 0:
+                                selector = UPDATE_SELECTORS[update_idx]
+                                self._loc(selector).click()
+                                self._wait_idle()
+                                self.logger.info(f"Updated resume: {selector}")
+                                return True
+                    except (PWError, PWTimeout):
                         pass
                 
                 self.logger.info("No CV refresh option found, but profile page accessed successfully")
@@ -391,6 +394,50 @@ class GulfTalentPlaywrightAgent:
             self.logger.error(f"Error during CV refresh: {e}")
             return False
     
+    def _race_profile_pages(self, urls, timeout: float = 15.0) -> Optional[Page]:
+        """Navigate candidate profile URLs concurrently and return the first page
+        that lands on a profile/dashboard, closing the losers"""
+        pages = []
+        for url in urls:
+            page = None
+            try:
+                page = self.context.new_page()
+                # 'commit' returns at first byte; the load continues in the
+                # browser while the remaining navigations are kicked off
+                page.goto(url, wait_until='commit', timeout=15000)
+                pages.append(page)
+            except Exception as e:
+                self.logger.warning(f"Failed to start navigation to {url}: {e}")
+                if page:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+
+        winner = None
+        deadline = time.time() + timeout
+        while winner is None and pages and time.time() < deadline:
+            for page in pages:
+                try:
+                    if "profile" in page.url or "dashboard" in page.url:
+                        page.wait_for_load_state('domcontentloaded', timeout=5000)
+                        winner = page
+                        self.logger.info(f"Successfully loaded profile page: {page.url}")
+                        break
+                except Exception:
+                    continue
+            if winner is None:
+                time.sleep(0.2)
+
+        for page in pages:
+            if page is not winner:
+                try:
+                    page.close()
+                except Exception:
+                    pass
+
+        return winner
+
     def run_daily_updates(self) -> Dict[str, Any]:
         """Run daily updates for GulfTalent.com"""
         try:
@@ -424,17 +471,18 @@ class GulfTalentPlaywrightAgent:
         """Update profile completion percentage"""
         try:
             # Navigate to profile page
-            self.page.goto("https://www.gulftalent.com/profile", wait_until='networkidle')
-            time.sleep(3)
+            self.page.goto("https://www.gulftalent.com/profile", wait_until='domcontentloaded')
+            self._locator_cache.clear()
+            self._wait_idle()
             
             # Look for profile completion indicators
-            completion_text = self.page.locator('text=/\\d+% complete/')
-            if completion_text.is_visible():
+            completion_text = self._loc('text=/\\d+% complete/')
+            if completion_text.is_visible(timeout=500):
                 completion = completion_text.text_content()
                 self.logger.info(f"Profile completion: {completion}")
             
             # Try to complete missing sections
-            incomplete_sections = self.page.locator('.incomplete-section, .profile-incomplete')
+            incomplete_sections = self._loc('.incomplete-section, .profile-incomplete')
             if incomplete_sections.count() > 0:
                 self.logger.info(f"Found {incomplete_sections.count()} incomplete sections")
                 # Could implement logic to fill missing sections
@@ -447,16 +495,13 @@ class GulfTalentPlaywrightAgent:
             return False
     
     def close(self):
-        """Close browser and cleanup"""
+        """Close this agent's context; the shared browser stays up"""
         try:
-            if self.page:
-                self.page.close()
+            # Closing the context closes its pages
             if self.context:
                 self.context.close()
-            if self.browser:
-                self.browser.close()
-            if hasattr(self, 'playwright'):
-                self.playwright.stop()
-            self.logger.info("GulfTalent.com browser closed")
+            self.page = None
+            self.context = None
+            self.logger.info("GulfTalent.com context closed")
         except Exception as e:
             self.logger.error(f"Error closing browser: {e}")
@@ -3,14 +3,83 @@
 Indeed.com UAE Automation Agent using Google OAuth
 """
 
+import functools
 import json
+import os
+import re
 import time
 import logging
-import requests
 from datetime import datetime
 from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
-from urllib.parse import urlencode, parse_qs, urlparse
+from urllib.parse import urlencode
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+from ..core.portal_config import get_portal_config
+from ._dom import find_first_visible
+
+# Browser auth state persisted across runs so warm starts skip OAuth
+STORAGE_STATE_PATH = 'src/data/indeed_storage_state.json'
+
+# Pre-joined selector unions, built once at import. Attribute and class
+# selectors lead each union: they resolve via querySelector, while the
+# text-matching alternatives force a layout-aware text scan and only
+# serve as fallbacks for markup without stable hooks.
+GOOGLE_LOGIN_SELECTOR = (
+    '[data-testid="google-login"], .google-login, '
+    'button:has-text("Continue with Google"), button:has-text("Google"), a:has-text("Google")'
+)
+RESUME_SELECTOR = (
+    '[data-testid="resume"], .resume, #resume, '
+    ':text-is("Indeed Resume"), :text-is("Resumes"), a:has-text("Indeed Resume")'
+)
+LOGGED_IN_SELECTOR = (
+    '[data-testid="user-menu"], .user-menu, .profile-menu, '
+    'a:has-text("Sign out"), a:has-text("Logout")'
+)
+NEXT_BUTTON_SELECTOR = 'button:has-text("Next"), button[type="submit"]'
+OAUTH_SIGN_IN_SELECTOR = 'button:has-text("Next"), button:has-text("Sign in"), button[type="submit"]'
+CONSENT_SELECTOR = 'button:has-text("Continue"), button:has-text("Allow"), button:has-text("Accept")'
+
+# Ordered candidates for the refresh_cv probes (priority matters)
+REFRESH_CANDIDATES = (
+    'button:has-text("Refresh")',
+    'button:has-text("Update")',
+    'a:has-text("Refresh CV")',
+    'a:has-text("Update CV")',
+    'button:has-text("Edit")',
+    'a:has-text("Edit")'
+)
+UPDATE_CANDIDATES = (
+    'button:has-text("Update")',
+    'button:has-text("Save")',
+    'button:has-text("Refresh")'
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _oauth_session():
+    """Pooled session keeping the TLS connection to Google warm
+
+    Built lazily so importing the agent (e.g. for config inspection)
+    does not pay the requests/urllib3 import cost.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
 
 class IndeedGoogleOAuthAgent:
     """Indeed.com UAE automation agent using Google OAuth"""
@@ -24,18 +93,20 @@ class IndeedGoogleOAuthAgent:
         self.oauth_settings = None
         self.access_token = None
         self.refresh_token = None
+        self.expires_at = None
+        self._last_written_tokens = None
+        self._last_refresh_ts = 0.0
         self._load_config()
         self._load_tokens()
     
     def _load_config(self):
         """Load Indeed.com configuration from job_portals.json"""
         try:
-            with open('src/data/job_portals.json', 'r') as f:
-                portals = json.load(f)
-                indeed_config = portals.get('indeed', {})
-                self.credentials = indeed_config.get('credentials', {})
-                self.oauth_settings = indeed_config.get('oauth_settings', {})
-                self.logger.info("Indeed.com OAuth configuration loaded successfully")
+            portals = get_portal_config()
+            indeed_config = portals.get('indeed', {})
+            self.credentials = indeed_config.get('credentials', {})
+            self.oauth_settings = indeed_config.get('oauth_settings', {})
+            self.logger.info("Indeed.com OAuth configuration loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading Indeed.com configuration: {e}")
             self.credentials = {
@@ -52,35 +123,76 @@ class IndeedGoogleOAuthAgent:
     def _load_tokens(self):
         """Load stored OAuth tokens if available"""
         try:
-            with open('src/data/indeed_oauth_tokens.json', 'r') as f:
-                tokens = json.load(f)
-                self.access_token = tokens.get('access_token')
-                self.refresh_token = tokens.get('refresh_token')
-                self.logger.info("OAuth tokens loaded successfully")
+            with open('src/data/indeed_oauth_tokens.json', 'rb') as f:
+                tokens = _json_loads(f.read())
+            self.access_token = tokens.get('access_token')
+            self.refresh_token = tokens.get('refresh_token')
+            self.expires_at = tokens.get('expires_at')
+            self.logger.info("OAuth tokens loaded successfully")
         except Exception as e:
             self.logger.info("No OAuth tokens found, will need to authenticate")
             self.access_token = None
             self.refresh_token = None
+            self.expires_at = None
     
     def _save_tokens(self):
-        """Save OAuth tokens for future use"""
+        """Save OAuth tokens atomically, skipping no-op writes"""
         try:
             token_data = {
                 "access_token": self.access_token,
                 "refresh_token": self.refresh_token,
-                "last_updated": datetime.now().isoformat()
+                "expires_at": self.expires_at
             }
-            with open('src/data/indeed_oauth_tokens.json', 'w') as f:
-                json.dump(token_data, f, indent=2)
+            # Compare before stamping last_updated so an unchanged refresh
+            # (same tokens back from Google) skips the disk write entirely
+            blob = _json_dumps(token_data)
+            if blob == self._last_written_tokens:
+                return
+
+            token_data["last_updated"] = datetime.now().isoformat()
+            path = 'src/data/indeed_oauth_tokens.json'
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(token_data))
+            # Atomic rename: a crash mid-write can no longer truncate the
+            # tokens file and force a full re-auth
+            os.replace(tmp_path, path)
+            self._last_written_tokens = blob
             self.logger.info("OAuth tokens saved successfully")
         except Exception as e:
             self.logger.error(f"Error saving OAuth tokens: {e}")
     
+    def _set_expiry(self, expires_in):
+        """Store absolute expiry with a 5-minute safety buffer
+
+        Absolute time survives reloads; a relative expires_in re-read from
+        disk would look fresh forever
+        """
+        if expires_in:
+            self.expires_at = time.time() + int(expires_in) - 300
+        else:
+            self.expires_at = None
+
+    def _token_is_fresh(self) -> bool:
+        """True when the stored access token is still usable"""
+        return bool(self.access_token) and time.time() < (self.expires_at or 0)
+
+    # Minimum spacing between refresh calls; concurrent callers piling up
+    # on one expired token only need the first round trip to Google
+    _REFRESH_MIN_INTERVAL = 60.0
+
     def _refresh_access_token(self) -> bool:
         """Refresh access token using refresh token"""
         try:
             if not self.refresh_token:
                 return False
+
+            # Debounce: a refresh that just ran (or just failed) should not
+            # be retried in a tight loop by every caller that notices the
+            # token is stale
+            if time.monotonic() - self._last_refresh_ts < self._REFRESH_MIN_INTERVAL:
+                return self.access_token is not None
+            self._last_refresh_ts = time.monotonic()
             
             refresh_url = "https://oauth2.googleapis.com/token"
             data = {
@@ -90,12 +202,13 @@ class IndeedGoogleOAuthAgent:
                 "grant_type": "refresh_token"
             }
             
-            response = requests.post(refresh_url, data=data)
+            response = _oauth_session().post(refresh_url, data=data, timeout=(5, 10))
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data.get('access_token')
                 if token_data.get('refresh_token'):
                     self.refresh_token = token_data['refresh_token']
+                self._set_expiry(token_data.get('expires_in'))
                 self._save_tokens()
                 self.logger.info("Access token refreshed successfully")
                 return True
@@ -107,16 +220,24 @@ class IndeedGoogleOAuthAgent:
             self.logger.error(f"Error refreshing access token: {e}")
             return False
     
-    def start_browser(self, headless: bool = True):
-        """Start Playwright browser"""
+    def start_browser(self, headless: bool = True, fresh: bool = False):
+        """Start a browser context on the shared Chromium
+
+        Reuses persisted auth state so warm runs skip the whole OAuth
+        handshake; pass fresh=True to force re-authentication.
+        """
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
+            # Deferred import: pulling in Playwright costs ~100ms and is
+            # only needed once a browser is actually requested
+            from ._browser_pool import BrowserPool
+
+            if fresh and os.path.exists(STORAGE_STATE_PATH):
+                os.remove(STORAGE_STATE_PATH)
+            storage_state = STORAGE_STATE_PATH if os.path.exists(STORAGE_STATE_PATH) else None
+            self.context = BrowserPool.instance().acquire_context(
                 headless=headless,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            self.context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                storage_state=storage_state
             )
             self.page = self.context.new_page()
             self.logger.info("Indeed.com OAuth browser started successfully")
@@ -150,11 +271,12 @@ class IndeedGoogleOAuthAgent:
                 "redirect_uri": self.oauth_settings["redirect_uri"]
             }
             
-            response = requests.post(token_url, data=data)
+            response = _oauth_session().post(token_url, data=data, timeout=(5, 10))
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data.get('access_token')
                 self.refresh_token = token_data.get('refresh_token')
+                self._set_expiry(token_data.get('expires_in'))
                 self._save_tokens()
                 self.logger.info("Successfully exchanged code for tokens")
                 return True
@@ -173,18 +295,24 @@ class IndeedGoogleOAuthAgent:
                 if not self.start_browser():
                     return False
             
-            # Check if we have valid tokens
-            if self.access_token and self.refresh_token:
-                if self._refresh_access_token():
-                    return self._login_with_google_oauth()
+            # Refresh only when the stored access token has actually
+            # expired; a fresh token needs no round-trip to Google
+            if not self._token_is_fresh() and self.refresh_token:
+                self._refresh_access_token()
             
             # Navigate to Indeed.com UAE
-            self.page.goto("https://ae.indeed.com", wait_until='networkidle')
-            time.sleep(2)
+            # domcontentloaded + waiting on the element actually needed is
+            # faster than networkidle, which Indeed's analytics pings defer
+            self.page.goto("https://ae.indeed.com", wait_until='domcontentloaded')
+            try:
+                self.page.locator('a.css-1sgldzl.e71d0lh0').wait_for(timeout=8000)
+            except Exception:
+                pass
             
             # Check if already logged in
             if self._is_logged_in():
                 self.logger.info("Already logged in to Indeed.com")
+                self._save_storage_state()
                 return True
             
             # Click on Sign In button
@@ -192,7 +320,7 @@ class IndeedGoogleOAuthAgent:
                 sign_in_button = self.page.locator('a.css-1sgldzl.e71d0lh0')
                 if sign_in_button.is_visible():
                     sign_in_button.click()
-                    time.sleep(3)
+                    self.page.wait_for_load_state('domcontentloaded')
                 else:
                     self.logger.error("Could not find sign in button")
                     return False
@@ -200,32 +328,17 @@ class IndeedGoogleOAuthAgent:
                 self.logger.error(f"Error clicking sign in: {e}")
                 return False
             
-            # Look for Google login button
-            google_login_selectors = [
-                'button:has-text("Continue with Google")',
-                'button:has-text("Google")',
-                '[data-testid="google-login"]',
-                '.google-login',
-                'a:has-text("Google")'
-            ]
-            
-            google_button = None
-            for selector in google_login_selectors:
-                try:
-                    google_button = self.page.locator(selector)
-                    if google_button.is_visible():
-                        self.logger.info(f"Found Google login button: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not google_button or not google_button.is_visible():
+            # Look for Google login button with one union query
+            google_button = self.page.locator(GOOGLE_LOGIN_SELECTOR).first
+            try:
+                google_button.wait_for(state='visible', timeout=5000)
+            except Exception:
                 self.logger.error("Could not find Google login button")
                 return False
             
-            # Click Google login button
+            # Click Google login button; the OAuth handler waits on the
+            # accounts.google.com URL, so no fixed pause is needed
             google_button.click()
-            time.sleep(3)
             
             # Handle Google OAuth flow
             return self._handle_google_oauth_flow()
@@ -239,48 +352,48 @@ class IndeedGoogleOAuthAgent:
         try:
             # Wait for Google OAuth page to load
             self.page.wait_for_url("**/accounts.google.com/**", timeout=10000)
-            time.sleep(3)
             
-            # Fill in Google credentials
+            # Fill in Google credentials; locator actions auto-wait, and
+            # the password screen is awaited explicitly instead of slept for
             email_field = self.page.locator('input[type="email"]')
             if email_field.is_visible():
                 email_field.fill(self.credentials['username'])
-                time.sleep(1)
                 
                 # Click Next
-                next_button = self.page.locator('button:has-text("Next"), button[type="submit"]')
+                next_button = self.page.locator(NEXT_BUTTON_SELECTOR).first
                 if next_button.is_visible():
                     next_button.click()
-                    time.sleep(3)
                 
                 # Fill password
                 password_field = self.page.locator('input[type="password"]')
+                try:
+                    password_field.wait_for(state='visible', timeout=10000)
+                except Exception:
+                    pass
                 if password_field.is_visible():
                     password_field.fill(self.credentials['password'])
-                    time.sleep(1)
                     
                     # Click Next/Sign in
-                    sign_in_button = self.page.locator('button:has-text("Next"), button:has-text("Sign in"), button[type="submit"]')
+                    sign_in_button = self.page.locator(OAUTH_SIGN_IN_SELECTOR).first
                     if sign_in_button.is_visible():
                         sign_in_button.click()
-                        time.sleep(5)
             
             # Handle consent screen if it appears
             try:
-                consent_button = self.page.locator('button:has-text("Continue"), button:has-text("Allow"), button:has-text("Accept")')
-                if consent_button.is_visible():
+                consent_button = self.page.locator(CONSENT_SELECTOR).first
+                if consent_button.is_visible(timeout=3000):
                     consent_button.click()
-                    time.sleep(3)
             except:
                 pass
             
             # Wait for redirect back to Indeed.com
             self.page.wait_for_url("**/indeed.com/**", timeout=30000)
-            time.sleep(5)
+            self.page.wait_for_load_state('networkidle')
             
             # Check if login was successful
             if self._is_logged_in():
                 self.logger.info("Successfully logged in to Indeed.com via Google OAuth")
+                self._save_storage_state()
                 return True
             else:
                 self.logger.error("OAuth login failed - not logged in")
@@ -290,48 +403,61 @@ class IndeedGoogleOAuthAgent:
             self.logger.error(f"Error during Google OAuth flow: {e}")
             return False
     
-    def _login_with_google_oauth(self) -> bool:
-        """Login using stored OAuth tokens"""
+    def _save_storage_state(self):
+        """Persist cookies/localStorage so the next run skips OAuth"""
         try:
-            # This would require implementing token-based authentication
-            # For now, we'll use the browser flow
-            return self.login()
+            self.context.storage_state(path=STORAGE_STATE_PATH)
         except Exception as e:
-            self.logger.error(f"Error with OAuth token login: {e}")
-            return False
-    
+            self.logger.warning(f"Could not save storage state: {e}")
+
     def _is_logged_in(self) -> bool:
         """Check if user is logged in to Indeed.com"""
         try:
-            # Check for logged in indicators
+            # Check for logged in indicators; the URL answers the common
+            # cases without touching the DOM at all
             current_url = self.page.url
             if "account" in current_url or "dashboard" in current_url:
                 return True
-            
-            # Check for user menu or profile elements
-            user_menu = self.page.locator('[data-testid="user-menu"], .user-menu, .profile-menu')
-            if user_menu.is_visible():
-                return True
-            
-            # Check for sign out option
-            sign_out = self.page.locator('a:has-text("Sign out"), a:has-text("Logout")')
-            if sign_out.is_visible():
-                return True
-            
-            return False
+            if "login" in current_url or "signin" in current_url:
+                return False
+
+            # Ambiguous URL: one union probe covers user menu and sign out
+            indicator = self.page.locator(LOGGED_IN_SELECTOR).first
+            return indicator.is_visible()
         except:
             return False
     
     def test_connection(self) -> Dict[str, Any]:
-        """Test connection to Indeed.com"""
+        """Test connection to Indeed.com
+
+        Tries a plain HTTP GET first — launching Chromium to read a page
+        title is orders of magnitude more expensive. The browser path
+        remains as a fallback for bot-blocked responses.
+        """
+        try:
+            response = _oauth_session().get(
+                "https://ae.indeed.com", timeout=(3, 5), allow_redirects=True
+            )
+            if response.status_code == 200:
+                title_match = re.search(r'<title[^>]*>([^<]*)</title>', response.text[:4096], re.I)
+                title = title_match.group(1).strip() if title_match else ""
+                if "Indeed" in title:
+                    return {
+                        "status": "success",
+                        "message": f"Connected to Indeed.com UAE - {title}",
+                        "url": response.url
+                    }
+        except Exception as e:
+            self.logger.info(f"HTTP connection probe failed, falling back to browser: {e}")
+
         try:
             if not self.page:
                 if not self.start_browser():
                     return {"status": "error", "message": "Failed to start browser"}
-            
+
             self.page.goto("https://ae.indeed.com", wait_until='networkidle')
             title = self.page.title()
-            
+
             if "Indeed" in title:
                 return {
                     "status": "success",
@@ -367,9 +493,10 @@ class IndeedGoogleOAuthAgent:
             profile_loaded = False
             for url in profile_urls:
                 try:
-                    self.page.goto(url, wait_until='networkidle')
-                    time.sleep(3)
-                    
+                    # Profile detection only needs the URL after the DOM is
+                    # ready; waiting out every XHR just slows the probe
+                    self.page.goto(url, wait_until='domcontentloaded', timeout=8000)
+
                     # Check if we're on a profile page
                     if "profile" in self.page.url or "account" in self.page.url:
                         profile_loaded = True
@@ -385,74 +512,41 @@ class IndeedGoogleOAuthAgent:
             
             # Look for CV refresh or update options
             try:
-                # Look for "Indeed Resume" section
-                resume_selectors = [
-                    'text="Indeed Resume"',
-                    'text="Resumes"',
-                    '[data-testid="resume"]',
-                    '.resume',
-                    '#resume',
-                    'a:has-text("Indeed Resume")'
-                ]
-                
+                # Look for "Indeed Resume" section with one union query
+                resume_element = self.page.locator(RESUME_SELECTOR).first
                 resume_found = False
-                for selector in resume_selectors:
-                    try:
-                        resume_element = self.page.locator(selector)
-                        if resume_element.is_visible():
-                            self.logger.info(f"Found resume section: {selector}")
-                            resume_found = True
-                            break
-                    except:
-                        continue
+                try:
+                    if resume_element.is_visible():
+                        self.logger.info("Found resume section")
+                        resume_found = True
+                except:
+                    pass
                 
                 if resume_found:
-                    # Try to find refresh/update options
-                    refresh_selectors = [
-                        'button:has-text("Refresh")',
-                        'button:has-text("Update")',
-                        'a:has-text("Refresh CV")',
-                        'a:has-text("Update CV")',
-                        'button:has-text("Edit")',
-                        'a:has-text("Edit")'
-                    ]
-                    
-                    for selector in refresh_selectors:
-                        try:
-                            refresh_button = self.page.locator(selector)
-                            if refresh_button.is_visible():
-                                refresh_button.click()
-                                time.sleep(3)
-                                self.logger.info(f"Clicked refresh button: {selector}")
-                                return True
-                        except:
-                            continue
+                    # Try refresh/update options in preference order; the
+                    # single evaluate also tells us which candidate won
+                    idx = find_first_visible(self.page, REFRESH_CANDIDATES)
+                    if idx >= 0:
+                        self.page.locator(REFRESH_CANDIDATES[idx]).first.click()
+                        self.page.wait_for_load_state('networkidle')
+                        self.logger.info(f"Clicked refresh button: {REFRESH_CANDIDATES[idx]}")
+                        return True
                     
                     # If no refresh button, try to click on the resume itself
                     try:
                         resume_click = self.page.locator('a:has-text("Indeed Resume")')
                         if resume_click.is_visible():
                             resume_click.click()
-                            time.sleep(3)
+                            self.page.wait_for_load_state('networkidle')
                             self.logger.info("Clicked on Indeed Resume")
                             
                             # Look for update options on the resume page
-                            update_selectors = [
-                                'button:has-text("Update")',
-                                'button:has-text("Save")',
-                                'button:has-text("Refresh")'
-                            ]
-                            
-                            for selector in update_selectors:
-                                try:
-                                    update_button = self.page.locator(selector)
-                                    if update_button.is_visible():
-                                        update_button.click()
-                                        time.sleep(2)
-                                        self.logger.info(f"Updated resume: {selector}")
-                                        return True
-                                except:
-                                    continue
+                            idx = find_first_visible(self.page, UPDATE_CANDIDATES)
+                            if idx >= 0:
+                                self.page.locator(UPDATE_CANDIDATES[idx]).first.click()
+                                self.page.wait_for_load_state('networkidle')
+                                self.logger.info(f"Updated resume: {UPDATE_CANDIDATES[idx]}")
+                                return True
                     except:
                         pass
                 
@@ -500,19 +594,24 @@ class IndeedGoogleOAuthAgent:
         """Update profile completion percentage"""
         try:
             # Navigate to profile page
-            self.page.goto("https://secure.indeed.com/account/profile", wait_until='networkidle')
-            time.sleep(3)
+            self.page.goto("https://secure.indeed.com/account/profile", wait_until='domcontentloaded')
             
-            # Look for profile completion indicators
+            # Look for profile completion indicators; text_content with a
+            # short timeout replaces the wait_for + is_visible + text_content
+            # triple, saving two protocol round trips
             completion_text = self.page.locator('text=/\\d+% complete/')
-            if completion_text.is_visible():
-                completion = completion_text.text_content()
+            try:
+                completion = completion_text.text_content(timeout=2000)
                 self.logger.info(f"Profile completion: {completion}")
+            except Exception:
+                pass
             
-            # Try to complete missing sections
+            # Try to complete missing sections; count() is one round trip,
+            # so take it once instead of re-querying for the log line
             incomplete_sections = self.page.locator('.incomplete-section, .profile-incomplete')
-            if incomplete_sections.count() > 0:
-                self.logger.info(f"Found {incomplete_sections.count()} incomplete sections")
+            n = incomplete_sections.count()
+            if n > 0:
+                self.logger.info(f"Found {n} incomplete sections")
                 # Could implement logic to fill missing sections
                 return True
             
@@ -523,16 +622,12 @@ class IndeedGoogleOAuthAgent:
             return False
     
     def close(self):
-        """Close browser and cleanup"""
+        """Close this agent's context; the shared browser stays up"""
         try:
-            if self.page:
-                self.page.close()
             if self.context:
                 self.context.close()
-            if self.browser:
-                self.browser.close()
-            if hasattr(self, 'playwright'):
-                self.playwright.stop()
-            self.logger.info("Indeed.com OAuth browser closed")
+            self.page = None
+            self.context = None
+            self.logger.info("Indeed.com OAuth context closed")
         except Exception as e:
             self.logger.error(f"Error closing browser: {e}")
@@ -3,21 +3,57 @@
 Indeed.com UAE Automation Agent using HTTP requests
 """
 
+import asyncio
 import json
+import os
+import re
 import time
 import logging
+import weakref
 import requests
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from ..core.portal_config import get_portal_config
+from ._http import DEFAULT_HEADERS, NETWORK_ERRORS, get_session
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_indented(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_indented(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=str).encode()
+
+# Compiled once; matched against raw bytes so the (often hundreds of KB)
+# login page never needs a full decode just to pull one token
+_CSRF_RE = re.compile(rb'name="csrf[^"]*" value="([^"]*)"')
+# Case-insensitive match on bytes: no full-buffer .lower() copy
+_COMPLETE_RE = re.compile(rb'complete', re.I)
+
 
 class IndeedHttpAgent:
     """Indeed.com UAE automation agent using HTTP requests"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
+        # One process-wide pool shared with the other portal agents
+        self.session = get_session()
         self.credentials = None
         self.cookies = None
+        # (monotonic timestamp, authenticated) of the last auth probe
+        self._auth_cache = (0.0, False)
         self._load_credentials()
         self._load_cookies()
         self._setup_session()
@@ -25,11 +61,9 @@ class IndeedHttpAgent:
     def _load_credentials(self):
         """Load Indeed.com credentials from job_portals.json"""
         try:
-            with open('src/data/job_portals.json', 'r') as f:
-                portals = json.load(f)
-                indeed_config = portals.get('indeed', {})
-                self.credentials = indeed_config.get('credentials', {})
-                self.logger.info("Indeed.com credentials loaded successfully")
+            portals = get_portal_config()
+            self.credentials = portals.get('indeed', {}).get('credentials', {})
+            self.logger.info("Indeed.com credentials loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading Indeed.com credentials: {e}")
             self.credentials = {
@@ -39,47 +73,101 @@ class IndeedHttpAgent:
     
     def _load_cookies(self):
         """Load Indeed.com cookies if available"""
+        path = 'src/data/indeed_cookies.json'
+        # Cold start is the common case; an exists() check is far cheaper
+        # than raising and unwinding FileNotFoundError in __init__
+        if not os.path.exists(path):
+            self.logger.info("No Indeed.com cookies found, will use login")
+            self.cookies = None
+            return
         try:
-            with open('src/data/indeed_cookies.json', 'r') as f:
-                self.cookies = json.load(f)
-                self.logger.info("Indeed.com cookies loaded successfully")
+            with open(path, 'rb') as f:
+                self.cookies = _json_loads(f.read())
+            self.logger.info("Indeed.com cookies loaded successfully")
         except Exception as e:
             self.logger.info("No Indeed.com cookies found, will use login")
             self.cookies = None
     
     def _setup_session(self):
-        """Setup HTTP session with headers and cookies"""
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
+        """Apply stored cookies to the shared session
+
+        Headers, pooling and retries are configured once in _http when
+        the shared session is built.
+        """
         if self.cookies and 'cookies' in self.cookies:
+            # Build a fresh jar in one pass and merge it in one bulk call:
+            # calling session.cookies.set() per cookie re-walks the live
+            # jar on every iteration, while assigning the jar wholesale
+            # would discard other agents' cookies from the shared session
+            jar = requests.cookies.RequestsCookieJar()
             for cookie in self.cookies['cookies']:
-                self.session.cookies.set(
-                    cookie['name'], 
-                    cookie['value'], 
+                jar.set(
+                    cookie['name'],
+                    cookie['value'],
                     domain=cookie.get('domain', ''),
                     path=cookie.get('path', '/')
                 )
+            self.session.cookies.update(jar)
             self.logger.info("Indeed.com cookies applied to session")
     
+    # How long a positive auth probe stays trusted before re-checking
+    _AUTH_CACHE_TTL = 60.0
+
+    def _stream_scan(self, url: str, regex):
+        """GET url and scan the body incrementally for regex
+
+        Returns (status_code, match_or_None, final_url). Reading stops at
+        the first hit: the tokens we look for sit in the head of pages
+        that can run to hundreds of KB, so early exit skips most of the
+        transfer.
+        """
+        buf = bytearray()
+        # requests.Session carries a boolean 'stream' attribute, so only
+        # a callable identifies the httpx backend
+        if callable(getattr(self.session, 'stream', None)):
+            # httpx streams via a dedicated method
+            with self.session.stream('GET', url) as response:
+                for chunk in response.iter_bytes(8192):
+                    buf += chunk
+                    match = regex.search(buf)
+                    if match:
+                        return response.status_code, match, str(response.url)
+                return response.status_code, None, str(response.url)
+        with self.session.get(url, stream=True, timeout=10) as response:
+            for chunk in response.iter_content(8192):
+                buf += chunk
+                match = regex.search(buf)
+                if match:
+                    return response.status_code, match, str(response.url)
+            return response.status_code, None, str(response.url)
+
     def _test_cookie_authentication(self) -> bool:
-        """Test if current cookies are still valid"""
+        """Test if current cookies are still valid
+
+        A positive result is cached briefly: login, refresh_cv and
+        run_daily_updates each re-check auth, and every skipped probe is
+        a full HTTPS round trip to the profile page.
+        """
+        now = time.monotonic()
+        ts, ok = self._auth_cache
+        if ok and now - ts < self._AUTH_CACHE_TTL:
+            return True
         try:
             response = self.session.get("https://secure.indeed.com/account/profile", timeout=10)
-            if response.status_code == 200 and "account" in response.url:
+            if response.status_code in (401, 403):
+                self._auth_cache = (0.0, False)
+                self.logger.info("Cookie authentication rejected")
+                return False
+            if response.status_code == 200 and "account" in str(response.url):
+                self._auth_cache = (now, True)
                 self.logger.info("Cookie authentication successful")
                 return True
             else:
+                self._auth_cache = (now, False)
                 self.logger.info("Cookie authentication failed")
                 return False
-        except Exception as e:
-            self.logger.error(f"Error testing cookie authentication: {e}")
+        except NETWORK_ERRORS as e:
+            self.logger.warning("Error testing cookie authentication: %s", e)
             return False
     
     def _try_cookie_login(self) -> bool:
@@ -95,22 +183,15 @@ class IndeedHttpAgent:
             if self._try_cookie_login():
                 return True
             
-            # Get login page to extract CSRF token
+            # Get login page and scan just enough of it for the CSRF token
             login_url = "https://secure.indeed.com/account/login"
-            response = self.session.get(login_url, timeout=10)
+            status, csrf_match, _ = self._stream_scan(login_url, _CSRF_RE)
             
-            if response.status_code != 200:
-                self.logger.error(f"Failed to access login page: {response.status_code}")
+            if status != 200:
+                self.logger.error(f"Failed to access login page: {status}")
                 return False
             
-            # Extract CSRF token if present
-            csrf_token = None
-            if 'csrf' in response.text.lower():
-                # Look for CSRF token in the page
-                import re
-                csrf_match = re.search(r'name="csrf[^"]*" value="([^"]*)"', response.text)
-                if csrf_match:
-                    csrf_token = csrf_match.group(1)
+            csrf_token = csrf_match.group(1).decode() if csrf_match else None
             
             # Prepare login data
             login_data = {
@@ -122,15 +203,16 @@ class IndeedHttpAgent:
                 login_data['csrf'] = csrf_token
             
             # Submit login form
+            # Both backends follow redirects here: requests does so by
+            # default and the httpx client is built with follow_redirects
             login_response = self.session.post(
                 login_url,
                 data=login_data,
-                timeout=10,
-                allow_redirects=True
+                timeout=10
             )
             
             # Check if login was successful
-            if login_response.status_code == 200 and "account" in login_response.url:
+            if login_response.status_code == 200 and "account" in str(login_response.url):
                 self.logger.info("Successfully logged in to Indeed.com")
                 self._save_cookies()
                 return True
@@ -138,15 +220,18 @@ class IndeedHttpAgent:
                 self.logger.error("Login failed")
                 return False
                 
-        except Exception as e:
-            self.logger.error(f"Error during Indeed.com login: {e}")
+        except NETWORK_ERRORS as e:
+            self.logger.warning("Error during Indeed.com login: %s", e)
             return False
     
     def _save_cookies(self):
         """Save cookies for future use"""
         try:
             cookies = []
-            for cookie in self.session.cookies:
+            # httpx exposes the underlying cookiejar via .jar; requests'
+            # jar iterates Cookie objects directly
+            jar = getattr(self.session.cookies, 'jar', self.session.cookies)
+            for cookie in jar:
                 cookies.append({
                     'name': cookie.name,
                     'value': cookie.value,
@@ -159,11 +244,19 @@ class IndeedHttpAgent:
             
             cookie_data = {
                 "cookies": cookies,
-                "last_updated": datetime.now().isoformat()
+                # orjson serializes datetime natively; the stdlib fallback
+                # stringifies via default=str
+                "last_updated": datetime.now()
             }
             
-            with open('src/data/indeed_cookies.json', 'w') as f:
-                json.dump(cookie_data, f, indent=2)
+            # Serialize once, write once, rename atomically: a crash
+            # mid-save can no longer truncate the cookie file and force a
+            # fresh login next run
+            path = 'src/data/indeed_cookies.json'
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps_indented(cookie_data))
+            os.replace(tmp_path, path)
             self.logger.info("Indeed.com cookies saved successfully")
         except Exception as e:
             self.logger.error(f"Error saving Indeed.com cookies: {e}")
@@ -177,7 +270,7 @@ class IndeedHttpAgent:
                 return {
                     "status": "success",
                     "message": f"Connected to Indeed.com UAE - Status: {response.status_code}",
-                    "url": response.url
+                    "url": str(response.url)
                 }
             else:
                 return {
@@ -185,7 +278,7 @@ class IndeedHttpAgent:
                     "message": f"Connection failed - Status: {response.status_code}"
                 }
                 
-        except Exception as e:
+        except NETWORK_ERRORS as e:
             return {
                 "status": "error",
                 "message": f"Connection test failed: {str(e)}"
@@ -224,8 +317,8 @@ class IndeedHttpAgent:
                 self.logger.info("Profile refresh not available via HTTP, but profile page accessed")
                 return True
                 
-        except Exception as e:
-            self.logger.error(f"Error during CV refresh: {e}")
+        except NETWORK_ERRORS as e:
+            self.logger.warning("Error during CV refresh: %s", e)
             return False
     
     def run_daily_updates(self) -> Dict[str, Any]:
@@ -255,26 +348,228 @@ class IndeedHttpAgent:
     def _update_profile_completion(self) -> bool:
         """Update profile completion percentage"""
         try:
-            # Navigate to profile page
+            # Navigate to profile page, stopping the read at the first
+            # completion marker
             profile_url = "https://secure.indeed.com/account/profile"
-            response = self.session.get(profile_url, timeout=10)
+            status, match, _ = self._stream_scan(profile_url, _COMPLETE_RE)
             
-            if response.status_code == 200:
-                # Parse profile completion from response
-                if "complete" in response.text.lower():
-                    self.logger.info("Profile completion checked successfully")
-                    return True
+            if status == 200 and match:
+                self.logger.info("Profile completion checked successfully")
+                return True
             
             return True
             
-        except Exception as e:
-            self.logger.error(f"Error updating profile completion: {e}")
+        except NETWORK_ERRORS as e:
+            self.logger.warning("Error updating profile completion: %s", e)
             return False
     
     def close(self):
-        """Close session"""
+        """Release this agent; the shared session stays open for others"""
+        self.logger.info("Indeed.com HTTP agent closed")
+
+
+# Per-host concurrency gates shared by the async agents: past a handful
+# of parallel requests Indeed answers 429 and forces backoff, which
+# wastes more time than queueing here. Scoped per event loop — a
+# semaphore binds to the loop that first waits on it, and these daily
+# runs are started with separate asyncio.run() calls.
+_HOST_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_HOST_CONCURRENCY = 8
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).hostname or ''
+    loop = asyncio.get_running_loop()
+    per_loop = _HOST_SEMAPHORES.get(loop)
+    if per_loop is None:
+        per_loop = _HOST_SEMAPHORES.setdefault(loop, {})
+    sem = per_loop.get(host)
+    if sem is None:
+        sem = per_loop.setdefault(host, asyncio.Semaphore(_HOST_CONCURRENCY))
+    return sem
+
+
+class IndeedHttpAgentAsync:
+    """Async Indeed.com agent for overlapping I/O-bound requests
+
+    The sync agent serializes its round trips; this variant runs on
+    aiohttp so independent requests (and independent agents, via
+    run_all) overlap their network waits. Use as an async context
+    manager:
+
+        async with IndeedHttpAgentAsync() as agent:
+            result = await agent.run_daily_updates()
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.session = None
+        self.credentials = None
+        self.cookies = None
+        self._load_credentials()
+        self._load_cookies()
+
+    # Config loading is identical to the sync agent
+    _load_credentials = IndeedHttpAgent._load_credentials
+    _load_cookies = IndeedHttpAgent._load_cookies
+
+    async def __aenter__(self):
+        # Deferred import keeps aiohttp optional for sync-only callers
+        import aiohttp
+
+        self.session = aiohttp.ClientSession(
+            headers=DEFAULT_HEADERS,
+            cookie_jar=aiohttp.CookieJar(),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        if self.cookies and 'cookies' in self.cookies:
+            for cookie in self.cookies['cookies']:
+                self.session.cookie_jar.update_cookies({cookie['name']: cookie['value']})
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _request(self, method: str, url: str, **kwargs):
+        """Issue a request under the per-host gate, honoring Retry-After
+
+        On 429 the server's Retry-After (or exponential backoff) is
+        slept out before retrying, up to three attempts.
+        """
+        for attempt in range(3):
+            async with _host_semaphore(url):
+                response = await self.session.request(method, url, **kwargs)
+            if response.status != 429:
+                return response
+            response.release()
+            delay = float(response.headers.get('Retry-After', 2 ** attempt))
+            self.logger.warning("Rate limited on %s, retrying in %.1fs", url, delay)
+            await asyncio.sleep(delay)
+        return response
+
+    async def login(self) -> bool:
+        """Login to Indeed.com UAE"""
         try:
-            self.session.close()
-            self.logger.info("Indeed.com HTTP session closed")
+            login_url = "https://secure.indeed.com/account/login"
+            response = await self._request('GET', login_url)
+            if response.status != 200:
+                response.release()
+                self.logger.error(f"Failed to access login page: {response.status}")
+                return False
+            body = await response.read()
+
+            csrf_match = _CSRF_RE.search(body)
+            csrf_token = csrf_match.group(1).decode() if csrf_match else None
+
+            login_data = {
+                '__email': self.credentials['username'],
+                '__password': self.credentials['password']
+            }
+            if csrf_token:
+                login_data['csrf'] = csrf_token
+
+            response = await self._request('POST', login_url, data=login_data)
+            response.release()
+            if response.status == 200 and "account" in str(response.url):
+                self.logger.info("Successfully logged in to Indeed.com")
+                return True
+            self.logger.error("Login failed")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error during Indeed.com login: {e}")
+            return False
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Indeed.com"""
+        try:
+            response = await self._request('GET', "https://ae.indeed.com")
+            response.release()
+            if response.status == 200:
+                return {
+                    "status": "success",
+                    "message": f"Connected to Indeed.com UAE - Status: {response.status}",
+                    "url": str(response.url)
+                }
+            return {
+                "status": "error",
+                "message": f"Connection failed - Status: {response.status}"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Connection test failed: {str(e)}"
+            }
+
+    async def refresh_cv(self) -> bool:
+        """Refresh CV on Indeed.com"""
+        try:
+            response = await self._request('GET', "https://secure.indeed.com/account/profile")
+            response.release()
+            if response.status != 200:
+                self.logger.error(f"Failed to access profile page: {response.status}")
+                return False
+
+            update_data = {
+                'action': 'refresh_profile',
+                'timestamp': int(time.time())
+            }
+            response = await self._request(
+                'POST', "https://secure.indeed.com/account/profile/update", data=update_data
+            )
+            response.release()
+            if response.status in (200, 302):
+                self.logger.info("Profile refresh triggered on Indeed.com")
+            else:
+                self.logger.info("Profile refresh not available via HTTP, but profile page accessed")
+            return True
+
         except Exception as e:
-            self.logger.error(f"Error closing session: {e}")
+            self.logger.error(f"Error during CV refresh: {e}")
+            return False
+
+    async def _update_profile_completion(self) -> bool:
+        """Update profile completion percentage"""
+        try:
+            response = await self._request('GET', "https://secure.indeed.com/account/profile")
+            if response.status == 200:
+                body = await response.read()
+                if _COMPLETE_RE.search(body):
+                    self.logger.info("Profile completion checked successfully")
+            else:
+                response.release()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating profile completion: {e}")
+            return False
+
+    async def run_daily_updates(self) -> Dict[str, Any]:
+        """Run daily updates for Indeed.com"""
+        try:
+            self.logger.info("Starting Indeed.com daily updates")
+
+            if not await self.login():
+                return {"status": "error", "message": "Failed to login"}
+
+            # Independent endpoints, so overlap the two round trips
+            cv_refreshed, profile_updated = await asyncio.gather(
+                self.refresh_cv(),
+                self._update_profile_completion()
+            )
+
+            return {
+                "status": "success",
+                "message": "Indeed.com daily updates completed",
+                "cv_refreshed": cv_refreshed,
+                "profile_updated": profile_updated
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": f"Daily updates failed: {str(e)}"}
+
+
+async def run_all(agents: List[IndeedHttpAgentAsync]) -> List[Dict[str, Any]]:
+    """Run daily updates for several async agents concurrently"""
+    return await asyncio.gather(*(agent.run_daily_updates() for agent in agents))
@@ -3,12 +3,31 @@
 Indeed.com UAE Automation Agent using Playwright
 """
 
-import json
-import time
+import os
 import logging
 from datetime import datetime
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+
+from ..core.portal_config import get_portal_config
+
+# Resource types and third-party hosts with no bearing on form-filling
+# or completion detection; stylesheets stay, since visibility checks
+# depend on computed layout
+_BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+_BLOCKED_HOSTS = ('doubleclick.net', 'google-analytics.com', 'googletagmanager.com', 'facebook.net')
+
+# Full auth state (cookies + local/session storage); Indeed keys its
+# "already signed in" detection off storage, which plain cookie
+# round-tripping loses
+STATE_PATH = 'src/data/indeed_state.json'
+
+
+def _should_abort(request) -> bool:
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        return True
+    hostname = urlparse(request.url).hostname or ''
+    return hostname.endswith(_BLOCKED_HOSTS)
 
 class IndeedPlaywrightAgent:
     """Indeed.com UAE automation agent using Playwright"""
@@ -19,58 +38,48 @@ class IndeedPlaywrightAgent:
         self.context = None
         self.page = None
         self.credentials = None
-        self.cookies = None
         self._load_credentials()
-        self._load_cookies()
     
     def _load_credentials(self):
         """Load Indeed.com credentials from job_portals.json"""
         try:
-            with open('src/data/job_portals.json', 'r') as f:
-                portals = json.load(f)
-                indeed_config = portals.get('indeed', {})
-                self.credentials = indeed_config.get('credentials', {})
-                self.logger.info("Indeed.com credentials loaded successfully")
+            portals = get_portal_config()
+            self.credentials = portals.get('indeed', {}).get('credentials', {})
+            self.logger.info("Indeed.com credentials loaded successfully")
         except Exception as e:
-            self.logger.error(f"Error loading Indeed.com credentials: {e}")
+            self.logger.error("Error loading Indeed.com credentials: %s", e)
             self.credentials = {
                 "username": "khanayubchand@gmail.com",
                 "password": "Miral@123"
             }
     
-    def _load_cookies(self):
-        """Load Indeed.com cookies if available"""
-        try:
-            with open('src/data/indeed_cookies.json', 'r') as f:
-                self.cookies = json.load(f)
-                self.logger.info("Indeed.com cookies loaded successfully")
-        except Exception as e:
-            self.logger.info("No Indeed.com cookies found, will use login")
-            self.cookies = None
-    
-    def _apply_cookies(self, context: BrowserContext):
-        """Apply stored cookies to browser context"""
-        if self.cookies and 'cookies' in self.cookies:
-            context.add_cookies(self.cookies['cookies'])
-            self.logger.info("Indeed.com cookies applied to browser context")
-    
     def start_browser(self, headless: bool = True):
         """Start Playwright browser"""
         try:
+            # Deferred import: loading Playwright costs ~100ms and is only
+            # needed when a browser is actually requested
+            from playwright.sync_api import sync_playwright
+
             self.playwright = sync_playwright().start()
             self.browser = self.playwright.chromium.launch(
                 headless=headless,
                 args=['--no-sandbox', '--disable-setuid-sandbox']
             )
             self.context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                storage_state=STATE_PATH if os.path.exists(STATE_PATH) else None
+            )
+            # Blocking images/fonts/trackers cuts most of the bytes on
+            # Indeed's ad-heavy pages, so domcontentloaded fires sooner
+            self.context.route(
+                '**/*',
+                lambda route: route.abort() if _should_abort(route.request) else route.continue_()
             )
-            self._apply_cookies(self.context)
             self.page = self.context.new_page()
             self.logger.info("Indeed.com Playwright browser started successfully")
             return True
         except Exception as e:
-            self.logger.error(f"Error starting Indeed.com browser: {e}")
+            self.logger.error("Error starting Indeed.com browser: %s", e)
             return False
     
     def login(self) -> bool:
@@ -81,8 +90,9 @@ class IndeedPlaywrightAgent:
                     return False
             
             # Navigate to Indeed.com UAE
-            self.page.goto("https://ae.indeed.com", wait_until='networkidle')
-            time.sleep(2)
+            # domcontentloaded fires seconds before networkidle on ad-heavy
+            # pages and the DOM is all we inspect
+            self.page.goto("https://ae.indeed.com", wait_until='domcontentloaded')
             
             # Check if already logged in
             if self._is_logged_in():
@@ -91,37 +101,22 @@ class IndeedPlaywrightAgent:
             
             # Click on Sign In button
             try:
-                # Try the specific Indeed.com UAE sign-in link
-                sign_in_button = self.page.locator('a.css-1sgldzl.e71d0lh0')
-                if sign_in_button.is_visible():
+                # One locator resolution instead of probing selectors one at
+                # a time; or_ picks whichever alternative matches first and
+                # real errors are no longer swallowed per-selector
+                sign_in_button = self.page.locator('a.css-1sgldzl.e71d0lh0').or_(
+                    self.page.locator('a[data-gnav-element-name="SignIn"]')
+                ).or_(
+                    self.page.get_by_role('link', name='Sign in')
+                ).or_(
+                    self.page.locator('button:has-text("Sign in"), [data-testid="signin"], .signin, #signin')
+                ).first
+                with self.page.expect_navigation(wait_until='domcontentloaded'):
                     sign_in_button.click()
-                    time.sleep(3)
-                else:
-                    # Try alternative selectors
-                    sign_in_selectors = [
-                        'a[data-gnav-element-name="SignIn"]',
-                        'a:has-text("Sign in")',
-                        'a:has-text("Sign In")',
-                        'button:has-text("Sign in")',
-                        '[data-testid="signin"]',
-                        '.signin',
-                        '#signin'
-                    ]
-                    
-                    for selector in sign_in_selectors:
-                        try:
-                            sign_in_button = self.page.locator(selector)
-                            if sign_in_button.is_visible():
-                                sign_in_button.click()
-                                time.sleep(3)
-                                break
-                        except:
-                            continue
             except Exception as e:
-                self.logger.error(f"Error clicking sign in: {e}")
+                self.logger.error("Error clicking sign in: %s", e)
                 # Try direct navigation to login page
-                self.page.goto("https://secure.indeed.com/auth?hl=en_AE&co=AE", wait_until='networkidle')
-                time.sleep(3)
+                self.page.goto("https://secure.indeed.com/auth?hl=en_AE&co=AE", wait_until='domcontentloaded')
             
             # Fill login form - Handle modern two-step login
             try:
@@ -176,7 +171,6 @@ class IndeedPlaywrightAgent:
                 if continue_button and continue_button.is_visible():
                     continue_button.click()
                     self.logger.info("Clicked continue button")
-                    time.sleep(3)
                 else:
                     self.logger.error("Could not find continue button")
                     return False
@@ -193,22 +187,21 @@ class IndeedPlaywrightAgent:
                     'input[aria-label*="Password"]'
                 ]
                 
+                # Event-driven wait: the field appears as soon as the email
+                # step posts back, so no 1s polling steps
+                try:
+                    self.page.wait_for_selector('input[type="password"]', timeout=10000)
+                except Exception:
+                    pass
                 password_field = None
-                max_wait = 10  # Wait up to 10 seconds for password field
-                for wait_time in range(max_wait):
-                    for selector in password_selectors:
-                        try:
-                            password_field = self.page.locator(selector)
-                            if password_field.is_visible():
-                                self.logger.info(f"Found password field: {selector}")
-                                break
-                        except:
-                            continue
-                    
-                    if password_field and password_field.is_visible():
-                        break
-                    
-                    time.sleep(1)
+                for selector in password_selectors:
+                    try:
+                        password_field = self.page.locator(selector)
+                        if password_field.is_visible():
+                            self.logger.info(f"Found password field: {selector}")
+                            break
+                    except:
+                        continue
                 
                 if not password_field or not password_field.is_visible():
                     self.logger.error("Could not find password field after email submission")
@@ -239,9 +232,9 @@ class IndeedPlaywrightAgent:
                         continue
                 
                 if submit_button and submit_button.is_visible():
-                    submit_button.click()
+                    with self.page.expect_navigation(wait_until='domcontentloaded'):
+                        submit_button.click()
                     self.logger.info("Clicked submit button")
-                    time.sleep(5)
                 else:
                     self.logger.error("Could not find submit button")
                     return False
@@ -256,11 +249,11 @@ class IndeedPlaywrightAgent:
                     return False
                     
             except Exception as e:
-                self.logger.error(f"Error during login form submission: {e}")
+                self.logger.error("Error during login form submission: %s", e)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error during Indeed.com login: {e}")
+            self.logger.error("Error during Indeed.com login: %s", e)
             return False
     
     def _is_logged_in(self) -> bool:
@@ -286,18 +279,12 @@ class IndeedPlaywrightAgent:
             return False
     
     def _save_cookies(self):
-        """Save cookies for future use"""
+        """Persist the context's full storage state for future runs"""
         try:
-            cookies = self.context.cookies()
-            cookie_data = {
-                "cookies": cookies,
-                "last_updated": datetime.now().isoformat()
-            }
-            with open('src/data/indeed_cookies.json', 'w') as f:
-                json.dump(cookie_data, f, indent=2)
-            self.logger.info("Indeed.com cookies saved successfully")
+            self.context.storage_state(path=STATE_PATH)
+            self.logger.info("Indeed.com storage state saved successfully")
         except Exception as e:
-            self.logger.error(f"Error saving Indeed.com cookies: {e}")
+            self.logger.error("Error saving Indeed.com storage state: %s", e)
     
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to Indeed.com"""
@@ -306,7 +293,7 @@ class IndeedPlaywrightAgent:
                 if not self.start_browser():
                     return {"status": "error", "message": "Failed to start browser"}
             
-            self.page.goto("https://ae.indeed.com", wait_until='networkidle')
+            self.page.goto("https://ae.indeed.com", wait_until='domcontentloaded')
             title = self.page.title()
             
             if "Indeed" in title:
@@ -344,8 +331,7 @@ class IndeedPlaywrightAgent:
             profile_loaded = False
             for url in profile_urls:
                 try:
-                    self.page.goto(url, wait_until='networkidle')
-                    time.sleep(3)
+                    self.page.goto(url, wait_until='domcontentloaded')
                     
                     # Check if we're on a profile page
                     if "profile" in self.page.url or "account" in self.page.url:
@@ -353,7 +339,7 @@ class IndeedPlaywrightAgent:
                         self.logger.info(f"Successfully loaded profile page: {url}")
                         break
                 except Exception as e:
-                    self.logger.warning(f"Failed to load {url}: {e}")
+                    self.logger.warning("Failed to load %s: %s", url, e)
                     continue
             
             if not profile_loaded:
@@ -384,33 +370,24 @@ class IndeedPlaywrightAgent:
                         continue
                 
                 if resume_found:
-                    # Try to find refresh/update options
-                    refresh_selectors = [
-                        'button:has-text("Refresh")',
-                        'button:has-text("Update")',
-                        'a:has-text("Refresh CV")',
-                        'a:has-text("Update CV")',
-                        'button:has-text("Edit")',
-                        'a:has-text("Edit")'
-                    ]
-                    
-                    for selector in refresh_selectors:
-                        try:
-                            refresh_button = self.page.locator(selector)
-                            if refresh_button.is_visible():
-                                refresh_button.click()
-                                time.sleep(3)
-                                self.logger.info(f"Clicked refresh button: {selector}")
-                                return True
-                        except:
-                            continue
+                    # Single union resolution for the refresh/update options
+                    refresh_button = self.page.locator(
+                        'button:has-text("Refresh"), button:has-text("Update"), '
+                        'a:has-text("Refresh CV"), a:has-text("Update CV"), '
+                        'button:has-text("Edit"), a:has-text("Edit")'
+                    ).first
+                    if refresh_button.is_visible():
+                        refresh_button.click()
+                        self.page.wait_for_load_state('domcontentloaded')
+                        self.logger.info("Clicked refresh button")
+                        return True
                     
                     # If no refresh button, try to click on the resume itself
                     try:
                         resume_click = self.page.locator('a:has-text("Indeed Resume")')
                         if resume_click.is_visible():
                             resume_click.click()
-                            time.sleep(3)
+                            self.page.wait_for_load_state('domcontentloaded')
                             self.logger.info("Clicked on Indeed Resume")
                             
                             # Look for update options on the resume page
@@ -425,7 +402,7 @@ class IndeedPlaywrightAgent:
                                     update_button = self.page.locator(selector)
                                     if update_button.is_visible():
                                         update_button.click()
-                                        time.sleep(2)
+                                        self.page.wait_for_load_state('domcontentloaded')
                                         self.logger.info(f"Updated resume: {selector}")
                                         return True
                                 except:
@@ -437,11 +414,11 @@ class IndeedPlaywrightAgent:
                 return True
                 
             except Exception as e:
-                self.logger.error(f"Error refreshing CV: {e}")
+                self.logger.error("Error refreshing CV: %s", e)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error during CV refresh: {e}")
+            self.logger.error("Error during CV refresh: %s", e)
             return False
     
     def run_daily_updates(self) -> Dict[str, Any]:
@@ -476,27 +453,31 @@ class IndeedPlaywrightAgent:
     def _update_profile_completion(self) -> bool:
         """Update profile completion percentage"""
         try:
-            # Navigate to profile page
-            self.page.goto("https://secure.indeed.com/account/profile", wait_until='networkidle')
-            time.sleep(3)
-            
-            # Look for profile completion indicators
-            completion_text = self.page.locator('text=/\\d+% complete/')
-            if completion_text.is_visible():
-                completion = completion_text.text_content()
-                self.logger.info(f"Profile completion: {completion}")
+            # Navigate to the profile page unless refresh_cv already left
+            # us on one; re-downloading it costs a full page load
+            if "profile" not in self.page.url and "account" not in self.page.url:
+                self.page.goto("https://secure.indeed.com/account/profile", wait_until='domcontentloaded')
             
-            # Try to complete missing sections
-            incomplete_sections = self.page.locator('.incomplete-section, .profile-incomplete')
-            if incomplete_sections.count() > 0:
-                self.logger.info(f"Found {incomplete_sections.count()} incomplete sections")
+            # One evaluate fetches both the completion percentage and the
+            # incomplete-section count; each separate locator call is its
+            # own protocol round trip to the browser
+            data = self.page.evaluate(
+                """() => ({
+                    pct: (document.body.innerText.match(/(\\d+)% complete/) || [])[1] || null,
+                    incomplete: document.querySelectorAll('.incomplete-section, .profile-incomplete').length
+                })"""
+            )
+            if data['pct']:
+                self.logger.info("Profile completion: %s%%", data['pct'])
+            if data['incomplete'] > 0:
+                self.logger.info("Found %d incomplete sections", data['incomplete'])
                 # Could implement logic to fill missing sections
                 return True
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Error updating profile completion: {e}")
+            self.logger.error("Error updating profile completion: %s", e)
             return False
     
     def close(self):
@@ -512,4 +493,4 @@ class IndeedPlaywrightAgent:
                 self.playwright.stop()
             self.logger.info("Indeed.com browser closed")
         except Exception as e:
-            self.logger.error(f"Error closing browser: {e}")
+            self.logger.error("Error closing browser: %s", e)
@@ -3,29 +3,122 @@ Job Portal Agent - Handles daily updates to job portals
 """
 
 import time
+import queue
 import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Any
 
-import sys
-import os
-# Add the src directory to Python path for absolute imports
-src_path = os.path.join(os.path.dirname(__file__), '..')
-sys.path.insert(0, src_path)
+from ..core.config import config
+from ..core.database import db
+from ..core.portal_config import get_portal_config
+from ..core.utils import generate_random_profile_update, setup_logging
 
-from core.config import config
-from core.database import db
-from core.utils import generate_random_profile_update, setup_logging
+_SINGLETON_LOCK = threading.Lock()
+
+_EXECUTOR = None
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Return the process-wide worker pool shared by all agent instances
+
+    One pool bounds total thread count no matter how many agents the
+    scheduler constructs, instead of each run spinning up and tearing
+    down its own workers.
+    """
+    global _EXECUTOR
+    with _SINGLETON_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='portal')
+        return _EXECUTOR
+
+
+class _DbBatcher:
+    """Background thread coalescing task records into bulk DB inserts
+
+    Workers hand records to submit(); a single consumer drains the queue
+    and writes via db.add_scheduled_tasks once 64 records accumulate or
+    100ms pass, whichever comes first. Callers never touch the DB.
+    """
+
+    _FLUSH_SIZE = 64
+    _FLUSH_INTERVAL = 0.1
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue(maxsize=256)
+        self._thread = threading.Thread(target=self._run, daemon=True, name='db-batcher')
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any]):
+        """Queue one task record for insertion"""
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until every record submitted so far has been written"""
+        self._queue.join()
+
+    def _run(self):
+        buf = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                buf.append(self._queue.get(timeout=timeout))
+                if deadline is None:
+                    deadline = time.monotonic() + self._FLUSH_INTERVAL
+            except queue.Empty:
+                pass
+            if buf and (len(buf) >= self._FLUSH_SIZE or time.monotonic() >= deadline):
+                self._write(buf)
+                buf = []
+                deadline = None
+
+    def _write(self, buf: List[Dict[str, Any]]):
+        try:
+            db.add_scheduled_tasks(buf)
+        except Exception as e:
+            self.logger.warning("Could not save to database: %s", e)
+        finally:
+            # Account every record so flush() cannot hang on a failed write
+            for _ in buf:
+                self._queue.task_done()
+
+
+_BATCHER = None
+
+
+def _db_batcher() -> _DbBatcher:
+    global _BATCHER
+    with _SINGLETON_LOCK:
+        if _BATCHER is None:
+            _BATCHER = _DbBatcher()
+        return _BATCHER
 
 
 class JobPortalAgent:
     """Agent for managing job portal updates"""
     
+    # Hoisted to class scope: immutable, allocated once per process
+    # instead of rebuilt on every call
+    _ACTIVITY_NAMES = (
+        "_update_profile_completion",
+        "_add_skill_endorsement",
+        "_update_job_preferences",
+        "_enhance_profile_visibility",
+        "_update_contact_info",
+    )
+    _JOB_PREFS = ("Full-time", "Remote", "Hybrid", "Contract")
+    
     def __init__(self):
         self.logger = setup_logging()
+        # Instance RNG keeps portal workers off the module-global one
+        self._rng = random.Random()
         self.job_portals = config.get_job_portals()
         self.driver = None
+        self._batcher = _db_batcher()
         self.setup_driver()
         # Load credentials from JSON file
         self.load_credentials()
@@ -33,11 +126,9 @@ class JobPortalAgent:
     def load_credentials(self):
         """Load job portal credentials from JSON file"""
         try:
-            import json
-            credentials_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'job_portals.json')
-            with open(credentials_path, 'r') as f:
-                portal_data = json.load(f)
-                
+            # Read-only cached view shared with the other agents
+            portal_data = get_portal_config()
+
             # Update job portals with credentials
             for portal_name, portal_config in portal_data.items():
                 if portal_name in self.job_portals:
@@ -45,7 +136,7 @@ class JobPortalAgent:
                     
             self.logger.info("Job portal credentials loaded successfully")
         except Exception as e:
-            self.logger.warning(f"Could not load job portal credentials: {e}")
+            self.logger.warning("Could not load job portal credentials: %s", e)
     
     def setup_driver(self):
         """Setup Chrome WebDriver with basic options"""
@@ -56,38 +147,30 @@ class JobPortalAgent:
     
     def login_to_portal(self, portal_name: str, credentials: Dict[str, str]) -> bool:
         """Login to a job portal (mock mode)"""
-        self.logger.info(f"Mock: Successfully logged into {portal_name}")
+        self.logger.info("Mock: Successfully logged into %s", portal_name)
         return True
     
     def update_profile_field(self, portal_name: str, field_name: str, value: Any) -> bool:
         """Update a specific profile field (mock mode)"""
-        self.logger.info(f"Mock: Updated {field_name} on {portal_name} with value: {value}")
+        self.logger.info("Mock: Updated %s on %s with value: %s", field_name, portal_name, value)
         return True
     
     def perform_random_activity(self, portal_name: str) -> bool:
         """Perform a random activity to show active engagement (mock mode)"""
-        activities = [
-            self._update_profile_completion,
-            self._add_skill_endorsement,
-            self._update_job_preferences,
-            self._enhance_profile_visibility,
-            self._update_contact_info
-        ]
-        
         try:
             # Choose a random activity
-            activity = random.choice(activities)
+            activity = getattr(self, self._rng.choice(self._ACTIVITY_NAMES))
             success = activity(portal_name)
             
             if success:
-                self.logger.info(f"Mock: Performed random activity on {portal_name}")
+                self.logger.info("Mock: Performed random activity on %s", portal_name)
                 return True
             else:
-                self.logger.warning(f"Mock: Failed to perform activity on {portal_name}")
+                self.logger.warning("Mock: Failed to perform activity on %s", portal_name)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error performing random activity on {portal_name}: {e}")
+            self.logger.error("Error performing random activity on %s: %s", portal_name, e)
             return False
     
     def _update_profile_completion(self, portal_name: str) -> bool:
@@ -102,8 +185,7 @@ class JobPortalAgent:
     
     def _update_job_preferences(self, portal_name: str) -> bool:
         """Update job preferences"""
-        preferences = ["Full-time", "Remote", "Hybrid", "Contract"]
-        return self.update_profile_field(portal_name, "job_preferences", random.choice(preferences))
+        return self.update_profile_field(portal_name, "job_preferences", self._rng.choice(self._JOB_PREFS))
     
     def _enhance_profile_visibility(self, portal_name: str) -> bool:
         """Enhance profile visibility"""
@@ -113,39 +195,53 @@ class JobPortalAgent:
         """Update contact information"""
         return self.update_profile_field(portal_name, "contact_info", "Updated")
     
+    def _process_one_portal(self, portal_name: str, portal_config: Dict[str, Any]):
+        """Process a single portal's daily update and queue its task record"""
+        self.logger.info("Processing %s (mock mode)", portal_name)
+        
+        # Mock successful update
+        activities_performed = self._rng.randint(1, 3)
+        self.logger.info("Mock: Performed %s activities on %s", activities_performed, portal_name)
+        
+        self.logger.info("Completed mock updates for %s", portal_name)
+        self._batcher.submit({
+            "task_name": f"daily_update_{portal_name}",
+            "task_type": "job_portal_update",
+            "schedule_time": datetime.now().strftime("%H:%M"),
+            "config": {"portal": portal_name, "activities_performed": activities_performed, "mode": "mock"}
+        })
+    
     def run_daily_updates(self):
         """Run daily updates for all configured job portals"""
         self.logger.info("Starting daily job portal updates (mock mode)")
         
-        for portal_name, portal_config in self.job_portals.items():
+        if not self.job_portals:
+            self.logger.info("Completed daily job portal updates (mock mode)")
+            return
+        
+        # Each portal's update is independent I/O, so fan out on the
+        # shared pool and let the run take max(portal_time) instead of
+        # the sum; workers queue their records on the batcher as they go
+        executor = _shared_executor()
+        futures = {
+            executor.submit(self._process_one_portal, portal_name, portal_config): portal_name
+            for portal_name, portal_config in self.job_portals.items()
+        }
+        for future in as_completed(futures):
+            portal_name = futures[future]
             try:
-                self.logger.info(f"Processing {portal_name} (mock mode)")
-                
-                # Mock successful update
-                activities_performed = random.randint(1, 3)
-                self.logger.info(f"Mock: Performed {activities_performed} activities on {portal_name}")
-                
-                # Log the activity
-                try:
-                    db.add_scheduled_task(
-                        task_name=f"daily_update_{portal_name}",
-                        task_type="job_portal_update",
-                        schedule_time=datetime.now().strftime("%H:%M"),
-                        config={"portal": portal_name, "activities_performed": activities_performed, "mode": "mock"}
-                    )
-                except Exception as db_error:
-                    self.logger.warning(f"Could not save to database: {db_error}")
-                
-                self.logger.info(f"Completed mock updates for {portal_name}")
-                
+                future.result()
             except Exception as e:
-                self.logger.error(f"Error processing {portal_name}: {e}")
-                continue
+                self.logger.error("Error processing %s: %s", portal_name, e)
+        
+        # Make sure this run's records hit the DB before we report done
+        self._batcher.flush()
         
         self.logger.info("Completed daily job portal updates (mock mode)")
     
     def close(self):
         """Close the agent (mock mode)"""
+        self._batcher.flush()
         self.logger.info("Mock: JobPortalAgent closed")
     
     def reinitialize_driver(self):
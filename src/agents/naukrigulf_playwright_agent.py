@@ -3,34 +3,87 @@
 NaukriGulf.com UAE Automation Agent using Playwright
 """
 
-import json
+import os
 import time
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+
+from ..core.portal_config import get_portal_config
+
+# The CV/profile page every daily-update step ends up on
+PROFILE_URL = "https://www.naukrigulf.com/mnj/userProfile/myCV?source=dashboard_cc"
+
+# Full session state (cookies + localStorage); its mtime doubles as the
+# freshness marker so a recent state skips the logged-in probe entirely
+STATE_PATH = 'src/data/naukrigulf_storage_state.json'
+STATE_MAX_AGE = 24 * 60 * 60
+
+# On-disk Chromium profile reused across runs and restarts
+PROFILE_DIR = 'src/data/.naukrigulf_profile'
+
 
 class NaukriGulfPlaywrightAgent:
     """NaukriGulf.com UAE automation agent using Playwright"""
     
+    # Selector unions pre-joined once at class load; every locator call
+    # reuses the same interned string
+    _LOGIN_SELECTOR = (
+        'a[href="https://www.naukrigulf.com/jobseeker/login"], a:has-text("Login"), '
+        'a.nav-link:has-text("Login"), button:has-text("Login"), '
+        '.login-btn, #login-btn, [data-testid="login"]'
+    )
+    _EMAIL_SELECTOR = (
+        'input[placeholder="Enter Email Id"], input[type="email"], input[name="email"], '
+        'input[placeholder*="email"], input[placeholder*="Email"], input[id*="email"], '
+        'input[name*="username"], input[name*="user"]'
+    )
+    _PASSWORD_SELECTOR = (
+        'input[placeholder="Enter Password"], input[type="password"], input[name="password"], '
+        'input[placeholder*="password"], input[placeholder*="Password"], input[id*="password"]'
+    )
+    _SUBMIT_SELECTOR = (
+        'button:has-text("Login"), button[type="submit"], button:has-text("Sign In"), '
+        'input[type="submit"], .submit-btn, #submit-btn'
+    )
+    _TEXT_INPUT_SELECTOR = (
+        'textarea[id="cvHeadline"][name="cvHeadline"], '
+        'textarea[placeholder="Give your profile a one line introduction"], '
+        'textarea[id="cvHeadline"], textarea[name="cvHeadline"], textarea.ng-inp-md, '
+        'input[type="text"], textarea, input[name*="headline"], input[id*="headline"], '
+        '.edit-box input, .edit-box textarea'
+    )
+    _SAVE_SELECTOR = (
+        'button[type="submit"].ng-btn.blue:has-text("Save"), '
+        'button[type="submit"][class*="ng-btn"][class*="blue"], '
+        'button.ng-btn.blue:has-text("Save"), button[type="submit"]:has-text("Save"), '
+        'button:has-text("Save"), button:has-text("Update"), button:has-text("Submit"), '
+        'button[type="submit"], .save-btn, .update-btn'
+    )
+    _LOGGED_IN_SELECTOR = (
+        ':text-is("Welcome Back!"), :text-is("AYUB KHA"), '
+        '.user-profile, .profile-info, [data-testid="user-menu"]'
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.browser = None
         self.context = None
         self.page = None
         self.credentials = None
-        self.cookies = None
+        # True once the CV/profile page is loaded in this session
+        self._on_profile_page = False
+        # True when a fresh storage state was restored at context creation
+        self._assume_logged_in = False
+        # Positive logged-in probes are trusted briefly within one run
+        self._login_state_cached: Optional[bool] = None
+        self._login_state_expiry = 0.0
         self._load_config()
-        self._load_cookies()
     
     def _load_config(self):
         """Load NaukriGulf.com configuration from job_portals.json"""
         try:
-            with open('src/data/job_portals.json', 'r') as f:
-                portals = json.load(f)
-                naukrigulf_config = portals.get('naukrigulf', {})
-                self.credentials = naukrigulf_config.get('credentials', {})
-                self.logger.info("NaukriGulf.com configuration loaded successfully")
+            self.credentials = get_portal_config().get('naukrigulf', {}).get('credentials', {})
+            self.logger.info("NaukriGulf.com configuration loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading NaukriGulf.com configuration: {e}")
             self.credentials = {
@@ -38,41 +91,92 @@ class NaukriGulfPlaywrightAgent:
                 "password": "Miral@18"
             }
     
-    def _load_cookies(self):
-        """Load extracted cookies from file"""
+    def _state_is_fresh(self) -> bool:
+        """True when the persisted storage state is recent enough to trust"""
+        try:
+            return (time.time() - os.path.getmtime(STATE_PATH)) < STATE_MAX_AGE
+        except OSError:
+            return False
+    
+    def _save_storage_state(self):
+        """Persist cookies + localStorage so the next run skips login"""
         try:
-            with open('src/data/naukrigulf_cookies.json', 'r') as f:
-                cookie_data = json.load(f)
-                self.cookies = cookie_data.get('cookies', [])
-                self.logger.info(f"Loaded {len(self.cookies)} cookies from file")
+            self.context.storage_state(path=STATE_PATH)
+            self.logger.info("NaukriGulf.com storage state saved")
         except Exception as e:
-            self.logger.warning(f"Could not load cookies: {e}")
-            self.cookies = []
+            self.logger.warning(f"Could not save storage state: {e}")
     
     def start_browser(self, headless: bool = True):
-        """Start Playwright browser with cookies"""
+        """Start a browser context on the shared Chromium
+
+        Chromium launch dominates a scheduled run (~1-2s); the process-wide
+        pool keeps one browser up and lends this agent an isolated context.
+        """
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
+            from ._browser_pool import BrowserPool
+            from .indeed_playwright_agent import _should_abort
+
+            # A persistent profile keeps cookies, localStorage and the HTTP
+            # disk cache across runs and restarts, so warm runs look fully
+            # signed in and portal assets load from cache
+            self.context = BrowserPool.instance().acquire_persistent_context(
+                PROFILE_DIR,
                 headless=headless,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            self.context = self.browser.new_context(
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             )
-            
-            # Apply cookies if available
-            if self.cookies:
-                self.context.add_cookies(self.cookies)
-                self.logger.info(f"Applied {len(self.cookies)} cookies to browser context")
+            # The state file's mtime still marks how recently we logged in
+            self._assume_logged_in = self._state_is_fresh()
+            # Same blocklist as the Indeed agent: images/fonts/trackers
+            # carry most of the page weight but none of the automation;
+            # stylesheets stay because visibility checks need layout
+            self.context.route(
+                '**/*',
+                lambda route: route.abort() if _should_abort(route.request) else route.continue_()
+            )
             
             self.page = self.context.new_page()
+            self._on_profile_page = False
+            # One default instead of per-call timeouts; failures surface in
+            # seconds rather than Playwright's 30s default
+            self.page.set_default_timeout(8000)
             self.logger.info("NaukriGulf.com browser started successfully")
             return True
         except Exception as e:
             self.logger.error(f"Error starting NaukriGulf.com browser: {e}")
             return False
     
+    def _api_login(self) -> bool:
+        """Try the auth endpoint directly through the context's HTTP client
+
+        context.request shares the browser's cookie jar, so a successful
+        POST authenticates the whole context without rendering the login
+        modal — no DOM, no form-filling, one round trip.
+        """
+        try:
+            response = self.context.request.post(
+                "https://www.naukrigulf.com/jobseeker/login",
+                form={
+                    "username": self.credentials['username'],
+                    "password": self.credentials['password']
+                }
+            )
+            if response.ok:
+                # A 200 here may just be the login page re-served; reload so
+                # the rendered page picks up the new cookies and only report
+                # success once the logged-in probe agrees, otherwise a bad
+                # response poisons the login cache and storage state
+                self.page.reload(wait_until='domcontentloaded')
+                if self._is_logged_in():
+                    self.logger.info("Logged in to NaukriGulf.com via API request")
+                    return True
+                self.logger.info("API login response OK but session unauthenticated, using form login")
+                return False
+            self.logger.info(f"API login unavailable (status {response.status}), using form login")
+            return False
+        except Exception as e:
+            self.logger.warning(f"API login failed: {e}")
+            return False
+    
     def login(self) -> bool:
         """Login to NaukriGulf.com (fallback if cookies don't work)"""
         try:
@@ -81,98 +185,46 @@ class NaukriGulfPlaywrightAgent:
                     return False
             
             # Navigate to NaukriGulf.com UAE
-            self.page.goto("https://www.naukrigulf.com", wait_until='networkidle')
-            time.sleep(3)
+            self.page.goto("https://www.naukrigulf.com", wait_until='domcontentloaded')
             
             # Check if already logged in
             if self._is_logged_in():
                 self.logger.info("Already logged in to NaukriGulf.com")
                 return True
             
-            # Click on Login button - using the specific selector from the screenshot
+            # Cheap path first: authenticate over HTTP and only fall back
+            # to the rendered login modal on rejection
+            if self._api_login():
+                self._mark_logged_in()
+                self._save_storage_state()
+                return True
+            
+            # Click on Login button - a comma union resolves every
+            # candidate in one round-trip instead of probing them serially
             try:
-                login_selectors = [
-                    'a[href="https://www.naukrigulf.com/jobseeker/login"]',
-                    'a:has-text("Login")',
-                    'a.nav-link:has-text("Login")',
-                    'button:has-text("Login")',
-                    '.login-btn',
-                    '#login-btn',
-                    '[data-testid="login"]'
-                ]
-                
-                login_button = None
-                for selector in login_selectors:
-                    try:
-                        login_button = self.page.locator(selector)
-                        if login_button.is_visible():
-                            self.logger.info(f"Found login button: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if login_button and login_button.is_visible():
-                    login_button.click()
-                    time.sleep(3)
-                else:
-                    self.logger.error("Could not find login button")
-                    return False
+                login_button = self.page.locator(self._LOGIN_SELECTOR).first
+                login_button.wait_for(state='visible', timeout=5000)
+                # The email-field wait below covers the modal opening
+                login_button.click()
             except Exception as e:
                 self.logger.error(f"Error clicking login: {e}")
                 return False
             
             # Fill login form - based on the modal structure from screenshot
             try:
-                # Wait for login modal to appear
-                time.sleep(2)
-                
-                # Try multiple selectors for email field based on the modal
-                email_selectors = [
-                    'input[placeholder="Enter Email Id"]',
-                    'input[type="email"]',
-                    'input[name="email"]',
-                    'input[placeholder*="email"]',
-                    'input[placeholder*="Email"]',
-                    'input[id*="email"]',
-                    'input[name*="username"]',
-                    'input[name*="user"]'
-                ]
-                
-                email_field = None
-                for selector in email_selectors:
-                    try:
-                        email_field = self.page.locator(selector)
-                        if email_field.is_visible():
-                            self.logger.info(f"Found email field: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if not email_field or not email_field.is_visible():
+                # Email field: wait_for is event-driven, so no sleep pad
+                # for the modal to appear
+                email_field = self.page.locator(self._EMAIL_SELECTOR).first
+                try:
+                    email_field.wait_for(state='visible', timeout=5000)
+                except Exception:
                     self.logger.error("Could not find email field")
                     return False
                 
-                # Try multiple selectors for password field based on the modal
-                password_selectors = [
-                    'input[placeholder="Enter Password"]',
-                    'input[type="password"]',
-                    'input[name="password"]',
-                    'input[placeholder*="password"]',
-                    'input[placeholder*="Password"]',
-                    'input[id*="password"]'
-                ]
-                
-                password_field = None
-                for selector in password_selectors:
-                    try:
-                        password_field = self.page.locator(selector)
-                        if password_field.is_visible():
-                            self.logger.info(f"Found password field: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if not password_field or not password_field.is_visible():
+                password_field = self.page.locator(self._PASSWORD_SELECTOR).first
+                try:
+                    password_field.wait_for(state='visible', timeout=3000)
+                except Exception:
                     self.logger.error("Could not find password field")
                     return False
                 
@@ -181,28 +233,10 @@ class NaukriGulfPlaywrightAgent:
                 password_field.fill(self.credentials['password'])
                 
                 # Click submit button - based on the modal structure
-                submit_selectors = [
-                    'button:has-text("Login")',
-                    'button[type="submit"]',
-                    'button:has-text("Sign In")',
-                    'input[type="submit"]',
-                    '.submit-btn',
-                    '#submit-btn'
-                ]
-                
-                submit_button = None
-                for selector in submit_selectors:
-                    try:
-                        submit_button = self.page.locator(selector)
-                        if submit_button.is_visible():
-                            self.logger.info(f"Found submit button: {selector}")
-                            break
-                    except:
-                        continue
-                
-                if submit_button and submit_button.is_visible():
+                submit_button = self.page.locator(self._SUBMIT_SELECTOR).first
+                if submit_button.is_visible():
                     submit_button.click()
-                    time.sleep(5)
+                    self.page.wait_for_load_state('domcontentloaded')
                 else:
                     self.logger.error("Could not find submit button")
                     return False
@@ -210,6 +244,8 @@ class NaukriGulfPlaywrightAgent:
                 # Check if login was successful
                 if self._is_logged_in():
                     self.logger.info("Successfully logged in to NaukriGulf.com")
+                    self._mark_logged_in()
+                    self._save_storage_state()
                     return True
                 else:
                     self.logger.error("Login failed - not logged in")
@@ -223,38 +259,37 @@ class NaukriGulfPlaywrightAgent:
             self.logger.error(f"Error during NaukriGulf.com login: {e}")
             return False
     
+    # How long a positive logged-in probe stays trusted
+    _LOGIN_CACHE_TTL = 60.0
+
+    def _mark_logged_in(self):
+        self._login_state_cached = True
+        self._login_state_expiry = time.monotonic() + self._LOGIN_CACHE_TTL
+
     def _is_logged_in(self) -> bool:
         """Check if user is logged in to NaukriGulf.com"""
+        # login() and update_cv_headline both probe this within one run;
+        # each skipped probe saves two protocol round trips
+        if self._login_state_cached is not None and time.monotonic() < self._login_state_expiry:
+            return self._login_state_cached
         try:
-            # Check for logged in indicators
-            current_url = self.page.url
-            page_title = self.page.title()
-            
-            # Check URL patterns
-            if any(pattern in current_url.lower() for pattern in ["dashboard", "profile", "myhome", "userprofile"]):
+            # URL and title in a single protocol round trip instead of two
+            info = self.page.evaluate(
+                "() => ({u: location.href.toLowerCase(), t: document.title.toLowerCase()})"
+            )
+            if any(pattern in info['u'] for pattern in ("dashboard", "profile", "myhome", "userprofile")):
+                self._mark_logged_in()
                 return True
-            
-            # Check page title patterns
-            if any(pattern in page_title.lower() for pattern in ["my home", "dashboard", "profile"]):
+            if any(pattern in info['t'] for pattern in ("my home", "dashboard", "profile")):
+                self._mark_logged_in()
                 return True
             
-            # Check for user-specific elements on the page
+            # One union probe for the user-specific elements
+            # (:text-is replaces the text= engine so it can comma-join)
             try:
-                user_elements = [
-                    'text="Welcome Back!"',
-                    'text="AYUB KHA"',
-                    '.user-profile',
-                    '.profile-info',
-                    '[data-testid="user-menu"]'
-                ]
-                
-                for selector in user_elements:
-                    try:
-                        element = self.page.locator(selector)
-                        if element.is_visible():
-                            return True
-                    except:
-                        continue
+                if self.page.locator(self._LOGGED_IN_SELECTOR).first.is_visible(timeout=1500):
+                    self._mark_logged_in()
+                    return True
             except:
                 pass
             
@@ -268,7 +303,7 @@ class NaukriGulfPlaywrightAgent:
             if not self.page:
                 return {"status": "error", "message": "Browser not started. Call start_browser() first."}
             
-            self.page.goto("https://www.naukrigulf.com", wait_until='networkidle')
+            self.page.goto("https://www.naukrigulf.com", wait_until='domcontentloaded')
             title = self.page.title()
             
             if "Naukri" in title or "naukri" in title.lower():
@@ -299,17 +334,19 @@ class NaukriGulfPlaywrightAgent:
             # Navigate to profile/CV page
             self.logger.info("Navigating to profile page...")
             try:
-                self.page.goto("https://www.naukrigulf.com/mnj/userProfile/myCV?source=dashboard_cc", wait_until='domcontentloaded', timeout=15000)
-                time.sleep(3)
+                self.page.goto(PROFILE_URL, wait_until='domcontentloaded', timeout=15000)
+                self._on_profile_page = True
             except Exception as e:
                 self.logger.warning(f"Navigation timeout (expected): {e}")
                 # Continue anyway - the page might still be usable
             
-            # Look for CV Headline section
+            # Look for CV Headline section; wait on the element we need
+            # rather than a fixed pad
             self.logger.info("Looking for CV Headline section...")
             headline_section = self.page.locator('#cvHeadline')
-            
-            if not headline_section.is_visible():
+            try:
+                headline_section.wait_for(state='visible', timeout=8000)
+            except Exception:
                 self.logger.error("CV Headline section not found")
                 return False
             
@@ -320,72 +357,27 @@ class NaukriGulfPlaywrightAgent:
                 return False
             
             self.logger.info("Clicking Edit button for CV Headline...")
+            # The text-input wait below covers the edit box opening
             edit_button.click()
-            time.sleep(2)
             
             # Look for the text input field - targeting the specific textarea
-            text_input_selectors = [
-                 'textarea[id="cvHeadline"][name="cvHeadline"]',
-                 'textarea[placeholder="Give your profile a one line introduction"]',
-                 'textarea[id="cvHeadline"]',
-                 'textarea[name="cvHeadline"]',
-                 'textarea.ng-inp-md',
-                 'input[type="text"]',
-                 'textarea',
-                 'input[name*="headline"]',
-                 'input[id*="headline"]',
-                 '.edit-box input',
-                 '.edit-box textarea'
-             ]
-            
-            text_input = None
-            for selector in text_input_selectors:
-                try:
-                    text_input = self.page.locator(selector)
-                    if text_input.is_visible():
-                        self.logger.info(f"Found text input: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not text_input or not text_input.is_visible():
+            text_input = self.page.locator(self._TEXT_INPUT_SELECTOR).first
+            try:
+                text_input.wait_for(state='visible', timeout=5000)
+            except Exception:
                 self.logger.error("Could not find text input field for CV headline")
                 return False
             
-            # Clear and fill the new headline
+            # fill() clears the field first and is synchronous with the
+            # DOM value, so no separate clear() call or settle pad
             self.logger.info(f"Updating CV headline to: {new_headline}")
-            text_input.clear()
             text_input.fill(new_headline)
-            time.sleep(1)
             
             # Look for Save/Update button - specifically targeting the Save button you mentioned
-            save_selectors = [
-                'button[type="submit"][class="ng-btn blue"]:has-text("Save")',
-                'button[type="submit"].ng-btn.blue:has-text("Save")',
-                'button[type="submit"][class*="ng-btn"][class*="blue"]',
-                'button.ng-btn.blue:has-text("Save")',
-                'button[type="submit"]:has-text("Save")',
-                'button:has-text("Save")',
-                'button:has-text("Update")',
-                'button:has-text("Submit")',
-                'button[type="submit"]',
-                '.save-btn',
-                '.update-btn'
-            ]
-            
-            save_button = None
-            for selector in save_selectors:
-                try:
-                    save_button = self.page.locator(selector)
-                    if save_button.is_visible():
-                        self.logger.info(f"Found save button: {selector}")
-                        break
-                except:
-                    continue
-            
-            if save_button and save_button.is_visible():
+            save_button = self.page.locator(self._SAVE_SELECTOR).first
+            if save_button.is_visible():
                 save_button.click()
-                time.sleep(3)
+                self.page.wait_for_load_state('domcontentloaded')
                 self.logger.info("CV headline updated successfully!")
                 return True
             else:
@@ -413,10 +405,26 @@ class NaukriGulfPlaywrightAgent:
             if not self.start_browser():
                 return {"status": "error", "message": "Failed to start browser"}
             
-            if not self._is_logged_in():
+            # Warm the profile page in a background tab while login state
+            # is verified: 'commit' returns as soon as the response starts
+            # and the load (and HTTP cache fill) continues alongside
+            prefetch_page = None
+            try:
+                prefetch_page = self.context.new_page()
+                prefetch_page.goto(PROFILE_URL, wait_until='commit', timeout=5000)
+            except Exception:
+                pass
+            
+            if not self._assume_logged_in and not self._is_logged_in():
                 if not self.login():
                     return {"status": "error", "message": "Failed to login"}
             
+            if prefetch_page:
+                try:
+                    prefetch_page.close()
+                except Exception:
+                    pass
+            
             # Refresh CV by updating headline
             cv_refreshed = self.refresh_cv()
             
@@ -438,23 +446,32 @@ class NaukriGulfPlaywrightAgent:
     def _update_profile_completion(self) -> bool:
         """Update profile completion percentage"""
         try:
-            # Navigate to profile page
-            self.page.goto("https://www.naukrigulf.com/mnj/userProfile/myCV?source=dashboard_cc", wait_until='networkidle')
-            time.sleep(3)
-            
-            # Look for profile completion indicators
+            # Navigate to the profile page only if update_cv_headline did
+            # not already leave us there
             completion_text = self.page.locator('text=/\\d+% complete/')
+            if not self._on_profile_page:
+                self.page.goto(PROFILE_URL, wait_until='domcontentloaded')
+                self._on_profile_page = True
+
+            # Wait on the element we actually read instead of a blind
+            # sleep; on same-URL re-entry reload only if the marker is
+            # missing from the DOM we already have
+            try:
+                completion_text.wait_for(state='visible', timeout=8000)
+            except Exception:
+                self.page.reload(wait_until='domcontentloaded')
+
             if completion_text.is_visible():
                 completion = completion_text.text_content()
-                self.logger.info(f"Profile completion: {completion}")
-            
+                self.logger.info("Profile completion: %s", completion)
+
             # Try to complete missing sections
-            incomplete_sections = self.page.locator('.incomplete-section, .profile-incomplete')
-            if incomplete_sections.count() > 0:
-                self.logger.info(f"Found {incomplete_sections.count()} incomplete sections")
+            incomplete_count = self.page.locator('.incomplete-section, .profile-incomplete').count()
+            if incomplete_count > 0:
+                self.logger.info("Found %d incomplete sections", incomplete_count)
                 # Could implement logic to fill missing sections
                 return True
-            
+
             return True
             
         except Exception as e:
@@ -462,16 +479,13 @@ class NaukriGulfPlaywrightAgent:
             return False
     
     def close(self):
-        """Close browser and cleanup"""
+        """Close this agent's page; the persistent context stays warm"""
         try:
             if self.page:
                 self.page.close()
-            if self.context:
-                self.context.close()
-            if self.browser:
-                self.browser.close()
-            if hasattr(self, 'playwright'):
-                self.playwright.stop()
-            self.logger.info("NaukriGulf.com browser closed")
+            self.page = None
+            self.context = None
+            self._login_state_cached = None
+            self.logger.info("NaukriGulf.com page closed")
         except Exception as e:
             self.logger.error(f"Error closing browser: {e}")
@@ -2,11 +2,15 @@
 Scheduler Agent - Handles launching applications at specific times
 """
 
+import sys
 import time
 import logging
+import signal
 import subprocess
 import os
+import threading
 import schedule
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -20,12 +24,84 @@ from ..core.utils import setup_logging
 class SchedulerAgent:
     """Agent for scheduling and launching applications"""
     
+    # Back-to-back checks (launch -> verify) reuse one /proc scan
+    _PROC_CACHE_TTL = 1.0
+    
     def __init__(self):
         self.logger = setup_logging()
         self.scheduler_config = config.get_scheduler_config()
         self.running_processes = {}
+        # Job handles we created, keyed by task name, for O(1) cancel
+        self._jobs = {}
+        self._proc_cache = (0.0, None)
+        # Lowercased name -> path / executable basename, filled as apps
+        # are scheduled; saves repeat stat calls and per-check lowering
+        self._app_paths = {}
+        self._app_basenames = {}
+        self._running_apps_cache = (0.0, None)
         self.setup_schedules()
     
+    def _is_running_proc(self, target: str, basename: Optional[str]) -> Optional[bool]:
+        """Check /proc/<pid>/comm directly for a name match on Linux
+        
+        Reading comm is one small file per PID, with none of psutil's
+        Process construction or create_time bookkeeping. comm truncates
+        names at 15 characters, so longer targets fall back to reading
+        the exe symlink. Returns None when /proc is unavailable so the
+        caller can use the portable psutil scan.
+        """
+        try:
+            pids = [pid for pid in os.listdir('/proc') if pid.isdigit()]
+        except OSError:
+            return None
+        
+        for pid in pids:
+            try:
+                with open(f'/proc/{pid}/comm') as f:
+                    name = f.read().rstrip().lower()
+            except OSError:
+                continue  # Process exited mid-walk
+            if target in name or name == basename:
+                return True
+        
+        if len(target) > 15 or (basename is not None and len(basename) > 15):
+            for pid in pids:
+                try:
+                    exe = os.readlink(f'/proc/{pid}/exe').lower()
+                except OSError:
+                    continue
+                if target in exe:
+                    return True
+        
+        return False
+    
+    def _path_exists(self, app_path: str) -> bool:
+        """os.path.exists with a positive cache; paths rarely disappear"""
+        if app_path in self._app_paths:
+            return True
+        if os.path.exists(app_path):
+            self._app_paths[app_path] = True
+            return True
+        return False
+    
+    def _process_names(self, force_refresh: bool = False):
+        """Return (Process, lowercased name) pairs from a briefly cached scan
+        
+        Only the cheap 'name' field is fetched up front; resolving the
+        executable path reads a /proc/<pid>/exe symlink per PID, so
+        callers do that lazily and only for candidate processes.
+        """
+        timestamp, procs = self._proc_cache
+        if not force_refresh and procs is not None and time.monotonic() - timestamp < self._PROC_CACHE_TTL:
+            return procs
+        procs = []
+        for proc in psutil.process_iter(['name']):
+            name = proc.info['name']
+            if name:
+                procs.append((proc, name.lower()))
+        self._proc_cache = (time.monotonic(), procs)
+        return procs
+    
     def setup_schedules(self):
         """Setup application schedules from configuration"""
         app_configs = self.scheduler_config.get('app_launcher', {}).get('applications', [])
@@ -35,11 +111,13 @@ class SchedulerAgent:
             app_path = app_config.get('path', '')
             schedule_time = app_config.get('schedule', '09:00')
             
-            if app_path and os.path.exists(app_path):
+            if app_path and self._path_exists(app_path):
+                self._app_basenames[app_name.lower()] = os.path.basename(app_path).lower()
                 # Schedule the application
-                schedule.every().day.at(schedule_time).do(
+                job = schedule.every().day.at(schedule_time).do(
                     self.launch_application, app_name, app_path
                 )
+                self._jobs[app_name] = job.tag(app_name)
                 self.logger.info(f"Scheduled {app_name} to launch at {schedule_time}")
             else:
                 self.logger.warning(f"Application path not found: {app_path}")
@@ -54,9 +132,10 @@ class SchedulerAgent:
             daily_updates_time = self.scheduler_config.get('daily_updates', {}).get('time', '09:00')
             
             # Schedule daily job portal updates
-            schedule.every().day.at(daily_updates_time).do(
+            job = schedule.every().day.at(daily_updates_time).do(
                 self.run_job_portal_daily_updates
             )
+            self._jobs["daily_job_portal_updates"] = job.tag("daily_job_portal_updates")
             
             self.logger.info(f"Scheduled daily job portal updates at {daily_updates_time}")
             
@@ -76,33 +155,21 @@ class SchedulerAgent:
         try:
             self.logger.info("Starting scheduled daily job portal updates")
             
-            # Import job portal agents
-            from .job_portal_agent import JobPortalAgent
-            from .bayt_http_agent import BaytHttpAgent
-            from .bayt_playwright_agent import BaytPlaywrightAgent
-            
-            # Run Bayt.com updates
-            try:
-                if BaytPlaywrightAgent is not None:
-                    bayt_agent = BaytPlaywrightAgent()
-                    bayt_result = bayt_agent.run_daily_updates()
-                    bayt_agent.close()
-                    self.logger.info(f"Bayt.com updates (Playwright): {bayt_result['status']} - {bayt_result['message']}")
-                elif BaytHttpAgent is not None:
-                    bayt_agent = BaytHttpAgent()
-                    bayt_result = bayt_agent.run_daily_updates()
-                    bayt_agent.close()
-                    self.logger.info(f"Bayt.com updates (HTTP): {bayt_result['status']} - {bayt_result['message']}")
-            except Exception as e:
-                self.logger.error(f"Error in Bayt.com updates: {e}")
-            
-            # Run updates for other portals
-            try:
-                job_portal_agent = JobPortalAgent()
-                job_portal_agent.run_daily_updates()
-                job_portal_agent.close()
-            except Exception as e:
-                self.logger.error(f"Error in job portal updates: {e}")
+            # The sub-agents talk to different sites, so overlap their
+            # network waits: wall time becomes the slowest agent instead
+            # of the sum of all of them
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    executor.submit(self._run_bayt_updates): "Bayt.com updates",
+                    executor.submit(self._run_portal_updates): "job portal updates",
+                }
+                for future in as_completed(futures, timeout=3600):
+                    label = futures[future]
+                    try:
+                        future.result()
+                        self.logger.info(f"Finished {label}")
+                    except Exception as e:
+                        self.logger.error(f"Error in {label}: {e}")
             
             # Update task run time
             self.update_job_portal_task_run_time()
@@ -112,21 +179,47 @@ class SchedulerAgent:
         except Exception as e:
             self.logger.error(f"Error in scheduled job portal updates: {e}")
     
+    def _run_bayt_updates(self):
+        """Run Bayt.com updates, preferring the Playwright agent"""
+        from .bayt_http_agent import BaytHttpAgent
+        from .bayt_playwright_agent import BaytPlaywrightAgent
+        
+        if BaytPlaywrightAgent is not None:
+            bayt_agent = BaytPlaywrightAgent()
+        elif BaytHttpAgent is not None:
+            bayt_agent = BaytHttpAgent()
+        else:
+            return
+        try:
+            bayt_result = bayt_agent.run_daily_updates()
+            self.logger.info(f"Bayt.com updates: {bayt_result['status']} - {bayt_result['message']}")
+        finally:
+            bayt_agent.close()
+    
+    def _run_portal_updates(self):
+        """Run updates for the remaining portals"""
+        from .job_portal_agent import JobPortalAgent
+        
+        job_portal_agent = JobPortalAgent()
+        try:
+            job_portal_agent.run_daily_updates()
+        finally:
+            job_portal_agent.close()
+    
     def update_job_portal_task_run_time(self):
         """Update the last run time for job portal updates task"""
         try:
-            # Get the task from database
-            tasks = db.get_active_scheduled_tasks()
-            for task in tasks:
-                if task['task_name'] == 'daily_job_portal_updates':
-                    # Calculate next run time (24 hours from now)
-                    last_run = datetime.now()
-                    next_run = last_run + timedelta(days=1)
-                    
-                    # Update the task
-                    db.update_task_run_time(task['id'], last_run, next_run)
-                    break
-                    
+            # Single-row indexed fetch instead of loading every active
+            # task and scanning for the name
+            task = db.get_task_by_name('daily_job_portal_updates')
+            if task:
+                # Calculate next run time (24 hours from now)
+                last_run = datetime.now()
+                next_run = last_run + timedelta(days=1)
+                
+                # Update the task
+                db.update_task_run_time(task['id'], last_run, next_run)
+                
         except Exception as e:
             self.logger.error(f"Error updating job portal task run time: {e}")
     
@@ -140,22 +233,44 @@ class SchedulerAgent:
             
             # Launch the application
             if os.name == 'nt':  # Windows
-                subprocess.Popen([app_path], shell=True)
+                process = subprocess.Popen([app_path], shell=True)
             else:  # Unix/Linux
-                subprocess.Popen([app_path])
+                process = subprocess.Popen([app_path])
             
-            # Wait a moment for the application to start
-            time.sleep(2)
+            # Poll the handle we already hold instead of sleeping a flat
+            # 2s and re-scanning every PID; most launches settle within
+            # the first few tens of milliseconds
+            started = False
+            for delay in (0.01, 0.02, 0.04, 0.08, 0.16, 0.32):
+                if process.poll() is not None:
+                    break  # Already exited
+                try:
+                    if psutil.Process(process.pid).status() != psutil.STATUS_ZOMBIE:
+                        started = True
+                        break
+                except psutil.NoSuchProcess:
+                    break
+                time.sleep(delay)
             
-            # Verify the application started
-            if self.is_application_running(app_name):
+            if started:
+                # Keep the handle: later running checks become an O(1)
+                # poll() instead of a process scan
+                self.running_processes[app_name] = process
+            elif self.is_application_running(app_name, force_refresh=True):
+                # The child exited immediately but the app is up: wrappers
+                # that fork-and-exit (daemonizing launchers, .desktop
+                # shims) look like failures to poll() alone
+                started = True
+
+            if started:
                 self.logger.info(f"Successfully launched {app_name}")
-                
+
                 # Log the launch
                 db.add_scheduled_task(
                     task_name=f"launch_{app_name}",
                     task_type="app_launcher",
-                    schedule_time=datetime.now().strftime("%H:%M"),
+                    # time.strftime skips building a datetime just to format it
+                    schedule_time=time.strftime("%H:%M"),
                     config={"app_name": app_name, "app_path": app_path}
                 )
                 
@@ -168,24 +283,43 @@ class SchedulerAgent:
             self.logger.error(f"Error launching {app_name}: {e}")
             return False
     
-    def is_application_running(self, app_name: str) -> bool:
+    def is_application_running(self, app_name: str, force_refresh: bool = False) -> bool:
         """Check if an application is currently running"""
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
+            # O(1) fast path for applications we launched ourselves
+            process = self.running_processes.get(app_name)
+            if process is not None:
+                if process.poll() is None:
+                    return True
+                del self.running_processes[app_name]
+            
+            target = app_name.lower()
+            basename = self._app_basenames.get(target)
+            
+            # Linux fast path: answer straight from /proc without
+            # constructing a psutil.Process per PID
+            if sys.platform.startswith('linux'):
+                found = self._is_running_proc(target, basename)
+                if found is not None:
+                    return found
+            
+            procs = self._process_names(force_refresh)
+            
+            # Check by process name first: already fetched and already
+            # lowercased, no syscalls; the precomputed executable
+            # basename catches apps whose schedule name differs
+            for proc, proc_name in procs:
+                if target in proc_name or proc_name == basename:
+                    return True
+            
+            # Only when no name matched, fall back to executable paths
+            for proc, proc_name in procs:
                 try:
-                    proc_name = proc.info['name'].lower()
-                    proc_exe = proc.info['exe']
-                    
-                    # Check by process name
-                    if app_name.lower() in proc_name:
-                        return True
-                    
-                    # Check by executable path
-                    if proc_exe and app_name.lower() in proc_exe.lower():
-                        return True
-                        
+                    proc_exe = proc.exe()
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
+                if proc_exe and target in proc_exe.lower():
+                    return True
             
             return False
             
@@ -196,21 +330,43 @@ class SchedulerAgent:
     def stop_application(self, app_name: str) -> bool:
         """Stop a running application"""
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
+            # Terminate via the handle we launched with, if we have it:
+            # no process scan at all
+            process = self.running_processes.pop(app_name, None)
+            if process is not None and process.poll() is None:
+                process.terminate()
                 try:
-                    proc_name = proc.info['name'].lower()
-                    proc_exe = proc.info['exe']
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                self.logger.info(f"Stopped {app_name}")
+                return True
+            
+            target = app_name.lower()
+            # Force a fresh scan: terminating a stale PID is worse than
+            # the cost of one extra pass
+            for proc, proc_name in self._process_names(force_refresh=True):
+                try:
+                    if target not in proc_name:
+                        # Resolve exe only for processes the name test
+                        # did not already decide
+                        proc_exe = proc.exe()
+                        if not proc_exe or target not in proc_exe.lower():
+                            continue
                     
-                    # Check if this is the target application
-                    if (app_name.lower() in proc_name or 
-                        (proc_exe and app_name.lower() in proc_exe.lower())):
-                        
-                        proc.terminate()
-                        proc.wait(timeout=5)  # Wait up to 5 seconds
-                        self.logger.info(f"Stopped {app_name}")
-                        return True
+                    proc.terminate()
+                    proc.wait(timeout=5)  # Wait up to 5 seconds
+                    self.logger.info(f"Stopped {app_name}")
+                    return True
                         
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
+                except psutil.NoSuchProcess:
+                    # Stale PID: drop our scan cache and psutil's own
+                    # process_iter cache so the next pass starts clean
+                    self._proc_cache = (0.0, None)
+                    if hasattr(psutil.process_iter, 'cache_clear'):
+                        psutil.process_iter.cache_clear()
+                    continue
+                except (psutil.AccessDenied, psutil.TimeoutExpired):
                     continue
             
             self.logger.warning(f"Could not find {app_name} to stop")
@@ -222,6 +378,61 @@ class SchedulerAgent:
     
     def get_running_applications(self) -> List[Dict[str, Any]]:
         """Get list of currently running applications"""
+        # Memoized briefly so a dashboard poller doesn't thrash /proc
+        timestamp, cached = self._running_apps_cache
+        if cached is not None and time.monotonic() - timestamp < self._PROC_CACHE_TTL:
+            return cached
+        
+        running_apps = None
+        if sys.platform.startswith('linux'):
+            running_apps = self._list_processes_ps()
+        if running_apps is None:
+            running_apps = self._list_processes_psutil()
+        
+        self._running_apps_cache = (time.monotonic(), running_apps)
+        return running_apps
+    
+    def _list_processes_ps(self) -> Optional[List[Dict[str, Any]]]:
+        """List processes with one ps fork instead of a readlink per PID
+        
+        psutil resolves /proc/<pid>/exe for every process, one syscall
+        each; ps reads the same data in a single child process. Returns
+        None when ps is unavailable so the caller can fall back.
+        """
+        try:
+            result = subprocess.run(
+                ['ps', '-eo', 'pid=,lstart=,args='],
+                capture_output=True, text=True, timeout=5,
+                env={**os.environ, 'LC_ALL': 'C'}  # Deterministic lstart format
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        
+        running_apps = []
+        for line in result.stdout.splitlines():
+            # pid, five lstart tokens, then the command line
+            parts = line.split(None, 6)
+            if len(parts) < 7:
+                continue
+            path = parts[6].split(None, 1)[0]
+            if path.startswith('['):  # Kernel thread
+                continue
+            try:
+                start_time = datetime.strptime(' '.join(parts[1:6]), '%a %b %d %H:%M:%S %Y')
+            except ValueError:
+                start_time = None
+            running_apps.append({
+                'name': os.path.basename(path),
+                'pid': int(parts[0]),
+                'path': path,
+                'start_time': start_time
+            })
+        return running_apps
+    
+    def _list_processes_psutil(self) -> List[Dict[str, Any]]:
+        """Portable process listing used off Linux or when ps fails"""
         running_apps = []
         
         try:
@@ -252,10 +463,12 @@ class SchedulerAgent:
                 app_name = task_config.get('app_name', '')
                 app_path = task_config.get('app_path', '')
                 
-                if app_path and os.path.exists(app_path):
-                    schedule.every().day.at(schedule_time).do(
+                if app_path and self._path_exists(app_path):
+                    self._app_basenames[app_name.lower()] = os.path.basename(app_path).lower()
+                    job = schedule.every().day.at(schedule_time).do(
                         self.launch_application, app_name, app_path
                     )
+                    self._jobs[task_name] = job.tag(task_name)
                     
                     # Log the scheduled task
                     db.add_scheduled_task(
@@ -281,8 +494,13 @@ class SchedulerAgent:
     def cancel_scheduled_task(self, task_name: str) -> bool:
         """Cancel a scheduled task"""
         try:
-            # Clear all jobs with the task name
-            schedule.clear(task_name)
+            # Cancel by stored handle when we created the job; walking
+            # the whole job list via schedule.clear is the fallback
+            job = self._jobs.pop(task_name, None)
+            if job is not None:
+                schedule.cancel_job(job)
+            else:
+                schedule.clear(task_name)
             
             # Update database
             # Note: This would require additional database methods to mark tasks as cancelled
@@ -321,13 +539,26 @@ class SchedulerAgent:
         """Run the scheduler loop"""
         self.logger.info("Starting scheduler service")
         
+        stop_event = threading.Event()
+        try:
+            # SIGTERM wakes the wait below, so shutdown is immediate
+            # instead of up to a full poll interval away
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        except ValueError:
+            pass  # Not the main thread; Ctrl-C still works
+        
         try:
-            while True:
+            while not stop_event.is_set():
                 # Run pending scheduled tasks
                 schedule.run_pending()
                 
-                # Sleep for a short interval
-                time.sleep(60)  # Check every minute
+                # Sleep until the next job is due instead of waking every
+                # minute regardless of how far away it is
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    stop_event.wait(timeout=60)
+                elif idle > 0:
+                    stop_event.wait(timeout=min(idle, 60))
                 
         except KeyboardInterrupt:
             self.logger.info("Scheduler stopped by user")
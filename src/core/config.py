@@ -7,26 +7,49 @@ import yaml
 from typing import Dict, Any, List
 from pathlib import Path
 
+try:
+    # libyaml's C parser is an order of magnitude faster than the pure
+    # Python one and behaves identically for safe loading
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class Config:
     """Configuration manager for the AI Agent"""
-    
+
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
+        self._mtime_ns = None
         self.config = self._load_config()
-    
+        self._refresh_sections()
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
+            stat = os.stat(self.config_path)
             with open(self.config_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+                data = yaml.load(file, Loader=_YamlLoader)
+            self._mtime_ns = stat.st_mtime_ns
+            return data if data is not None else self._get_default_config()
         except FileNotFoundError:
             print(f"Config file {self.config_path} not found. Using default configuration.")
             return self._get_default_config()
         except yaml.YAMLError as e:
             print(f"Error parsing config file: {e}")
             return self._get_default_config()
-    
+
+    def _refresh_sections(self):
+        """Cache top-level sections so get_* calls are attribute reads"""
+        self._job_portals = self.config.get("job_portals", {})
+        self._email_cfg = self.config.get("email", {})
+        self._gcc_countries = self.config.get("gcc_countries", [])
+        self._scraping_cfg = self.config.get("scraping", {})
+        self._cv_cfg = self.config.get("cv_optimization", {})
+        self._scheduler_cfg = self.config.get("scheduler", {})
+        self._db_cfg = self.config.get("database", {})
+        self._logging_cfg = self.config.get("logging", {})
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration"""
         return {
@@ -39,47 +62,57 @@ class Config:
             "database": {},
             "logging": {}
         }
-    
+
     def get_job_portals(self) -> Dict[str, Any]:
         """Get job portal configurations"""
-        return self.config.get("job_portals", {})
-    
+        return self._job_portals
+
     def get_email_config(self) -> Dict[str, Any]:
         """Get email configuration"""
-        return self.config.get("email", {})
-    
+        return self._email_cfg
+
     def get_gcc_countries(self) -> List[Dict[str, Any]]:
         """Get GCC countries configuration"""
-        return self.config.get("gcc_countries", [])
-    
+        return self._gcc_countries
+
     def get_scraping_config(self) -> Dict[str, Any]:
         """Get scraping configuration"""
-        return self.config.get("scraping", {})
-    
+        return self._scraping_cfg
+
     def get_cv_optimization_config(self) -> Dict[str, Any]:
         """Get CV optimization configuration"""
-        return self.config.get("cv_optimization", {})
-    
+        return self._cv_cfg
+
     def get_scheduler_config(self) -> Dict[str, Any]:
         """Get scheduler configuration"""
-        return self.config.get("scheduler", {})
-    
+        return self._scheduler_cfg
+
     def get_database_config(self) -> Dict[str, Any]:
         """Get database configuration"""
-        return self.config.get("database", {})
-    
+        return self._db_cfg
+
     def get_logging_config(self) -> Dict[str, Any]:
         """Get logging configuration"""
-        return self.config.get("logging", {})
-    
+        return self._logging_cfg
+
     def get_openai_api_key(self) -> str:
         """Get OpenAI API key"""
-        return self.config.get("cv_optimization", {}).get("openai_api_key", "")
-    
+        return self._cv_cfg.get("openai_api_key", "")
+
     def reload(self):
-        """Reload configuration from file"""
+        """Reload configuration from file if it changed on disk
+
+        A stat call per reload replaces a full YAML re-parse when the
+        file's mtime is unchanged, which is the common case.
+        """
+        try:
+            if self._mtime_ns is not None and os.stat(self.config_path).st_mtime_ns == self._mtime_ns:
+                return
+        except OSError:
+            pass
         self.config = self._load_config()
+        self._refresh_sections()
 
 
 # Global configuration instance
-config = Config() 
\ No newline at end of file
+config = Config()
@@ -2,30 +2,196 @@
 Database management for the AI Agent & Productivity Tool
 """
 
-import sqlite3
+import atexit
 import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from .config import config
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# One explicit adapter instead of sqlite3's per-bind default conversion
+# (deprecated since 3.12); ISO with a space separator matches how
+# SQLite's own CURRENT_TIMESTAMP renders
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(sep=' ', timespec='seconds'))
+
+# Shared SQL constants: reusing the same statement text lets SQLite's
+# per-connection statement cache skip parse and plan on repeat calls
+_SQL_INSERT_APPLICATION = """
+    INSERT INTO job_applications (job_title, company, portal, country, cv_version, notes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_EMAIL = """
+    INSERT INTO email_responses (sender_email, subject, content, response_type, job_application_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_SCRAPED = """
+    INSERT INTO scraped_data (source_url, business_name, category, phone, email, address, city, country, data_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_TASK = """
+    INSERT INTO scheduled_tasks (task_name, task_type, schedule_time, config_json)
+    VALUES (?, ?, ?, ?)
+"""
+
 
 class Database:
     """Database manager for storing application data"""
     
+    # Writes queue up and hit disk in one transaction per batch,
+    # amortizing the fsync and connection cost across operations
+    _FLUSH_SIZE = 100
+    _FLUSH_INTERVAL = 0.25
+    
+    # Active tasks change on add/cancel, not per scheduler tick
+    _TASKS_CACHE_TTL = 5.0
+    
     def __init__(self, db_path: str = None):
         if db_path is None:
             db_config = config.get_database_config()
             db_path = db_config.get("path", "automa.db")
         
         self.db_path = db_path
+        self._local = threading.local()
         self._init_database()
+        self._tasks_cache = (0.0, None)
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True, name='db-writer')
+        self._writer.start()
+        atexit.register(self.flush)
+    
+    def _enqueue(self, sql: str, params: tuple):
+        """Queue a write and return immediately"""
+        self._write_queue.put((sql, params, None, False))
+    
+    def _enqueue_many(self, sql: str, rows: List[tuple]):
+        """Queue a multi-row write executed via executemany"""
+        self._write_queue.put((sql, rows, None, True))
+    
+    def _enqueue_wait(self, sql: str, params: tuple) -> int:
+        """Queue a write and block for its lastrowid"""
+        future = Future()
+        self._write_queue.put((sql, params, future, False))
+        return future.result()
+    
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self._write_queue.join()
+    
+    def _writer_loop(self):
+        """Single writer thread owning the persistent write connection
+        
+        Batches are committed when 100 statements accumulate, 250ms pass,
+        or a caller is waiting on a lastrowid — whichever comes first.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        batch = []
+        urgent = False
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._write_queue.get(timeout=timeout)
+                batch.append(item)
+                urgent = urgent or item[2] is not None
+                if deadline is None:
+                    deadline = time.monotonic() + self._FLUSH_INTERVAL
+            except queue.Empty:
+                pass
+            if batch and (urgent or len(batch) >= self._FLUSH_SIZE or time.monotonic() >= deadline):
+                self._commit_batch(conn, batch)
+                batch = []
+                urgent = False
+                deadline = None
+    
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list):
+        try:
+            for sql, params, future, many in batch:
+                if many:
+                    conn.executemany(sql, params)
+                else:
+                    cursor = conn.execute(sql, params)
+                    if future is not None:
+                        future.set_result(cursor.lastrowid)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # Waiting callers get the exception; fire-and-forget writes
+            # can only be logged
+            logger.error("Batched write failed, batch rolled back: %s", e)
+            for _, _, future, _ in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+        finally:
+            for _ in batch:
+                self._write_queue.task_done()
+    
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row, json_field: str) -> Dict[str, Any]:
+        """Convert a row, decoding its serialized JSON column to a dict"""
+        record = dict(row)
+        raw = record.get(json_field)
+        if raw:
+            try:
+                record[json_field] = _loads(raw)
+            except ValueError:
+                pass  # Leave malformed payloads as stored
+        return record
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Per-thread persistent connection for read paths
+        
+        Opening a connection per query costs file-open, pragma and page
+        cache warm-up each time; one cached connection per thread (WAL
+        readers don't block the writer) keeps the page cache hot.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-20000')
+            self._local.conn = conn
+        return conn
     
     def _init_database(self):
         """Initialize database tables"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
+            # WAL halves the fsyncs per commit and lets readers run
+            # alongside the writer thread; the journal mode sticks to
+            # the database file, the rest are per-connection defaults
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.execute('PRAGMA cache_size=-20000')
+            
             # Job applications table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS job_applications (
@@ -90,174 +256,216 @@ class Database:
                 )
             """)
             
+            # Covering the filter columns plus the ORDER BY column turns
+            # each get_* query from a full scan + sort into a range seek
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_status_nextrun
+                ON scheduled_tasks(status, next_run)
+            """)
+            # get_task_by_name filters on (task_name, status); without
+            # this the status/next_run index does not apply
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_name_status
+                ON scheduled_tasks(task_name, status)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobapp_status_country_date
+                ON job_applications(status, country, application_date DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_email_processed_date
+                ON email_responses(processed, received_date DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scraped_cat_city_country_date
+                ON scraped_data(category, city, country, scraped_date DESC)
+            """)
+            
             conn.commit()
     
     def add_job_application(self, job_title: str, company: str, portal: str, 
                            country: str, cv_version: str = None, notes: str = None) -> int:
         """Add a new job application"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO job_applications (job_title, company, portal, country, cv_version, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (job_title, company, portal, country, cv_version, notes))
-            conn.commit()
-            return cursor.lastrowid
+        return self._enqueue_wait(_SQL_INSERT_APPLICATION,
+                                  (job_title, company, portal, country, cv_version, notes))
     
     def update_job_application_status(self, application_id: int, status: str, 
                                     response_received: bool = False, response_date: datetime = None):
         """Update job application status"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            if response_date:
-                cursor.execute("""
-                    UPDATE job_applications 
-                    SET status = ?, response_received = ?, response_date = ?
-                    WHERE id = ?
-                """, (status, response_received, response_date, application_id))
-            else:
-                cursor.execute("""
-                    UPDATE job_applications 
-                    SET status = ?, response_received = ?
-                    WHERE id = ?
-                """, (status, response_received, application_id))
-            conn.commit()
+        if response_date:
+            self._enqueue("""
+                UPDATE job_applications 
+                SET status = ?, response_received = ?, response_date = ?
+                WHERE id = ?
+            """, (status, response_received, response_date, application_id))
+        else:
+            self._enqueue("""
+                UPDATE job_applications 
+                SET status = ?, response_received = ?
+                WHERE id = ?
+            """, (status, response_received, application_id))
     
     def get_job_applications(self, status: str = None, country: str = None, 
                            limit: int = 100) -> List[Dict[str, Any]]:
         """Get job applications with optional filters"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM job_applications WHERE 1=1"
-            params = []
-            
-            if status:
-                query += " AND status = ?"
-                params.append(status)
-            
-            if country:
-                query += " AND country = ?"
-                params.append(country)
-            
-            query += " ORDER BY application_date DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        # Read-your-writes: drain pending writes before querying
+        self.flush()
+        cursor = self._get_conn().cursor()
+
+        query = "SELECT * FROM job_applications WHERE 1=1"
+        params = []
+
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        if country:
+            query += " AND country = ?"
+            params.append(country)
+
+        query += " ORDER BY application_date DESC LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
     
     def add_email_response(self, sender_email: str, subject: str, content: str,
                           response_type: str, job_application_id: int = None) -> int:
         """Add a new email response"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO email_responses (sender_email, subject, content, response_type, job_application_id)
-                VALUES (?, ?, ?, ?, ?)
-            """, (sender_email, subject, content, response_type, job_application_id))
-            conn.commit()
-            return cursor.lastrowid
+        return self._enqueue_wait(_SQL_INSERT_EMAIL,
+                                  (sender_email, subject, content, response_type, job_application_id))
     
     def get_unprocessed_emails(self) -> List[Dict[str, Any]]:
         """Get unprocessed email responses"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM email_responses 
-                WHERE processed = FALSE 
-                ORDER BY received_date DESC
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+        # Read-your-writes: drain pending writes before querying
+        self.flush()
+        cursor = self._get_conn().cursor()
+        cursor.execute("""
+            SELECT * FROM email_responses
+            WHERE processed = FALSE
+            ORDER BY received_date DESC
+        """)
+        return [dict(row) for row in cursor.fetchall()]
     
     def mark_email_processed(self, email_id: int):
         """Mark email as processed"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE email_responses 
-                SET processed = TRUE 
-                WHERE id = ?
-            """, (email_id,))
-            conn.commit()
+        self._enqueue("""
+            UPDATE email_responses 
+            SET processed = TRUE 
+            WHERE id = ?
+        """, (email_id,))
     
     def add_scraped_data(self, source_url: str, business_name: str, category: str,
                          phone: str = None, email: str = None, address: str = None,
                          city: str = None, country: str = None, data_json: Dict = None) -> int:
         """Add scraped business data"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            data_json_str = json.dumps(data_json) if data_json else None
-            cursor.execute("""
-                INSERT INTO scraped_data (source_url, business_name, category, phone, email, address, city, country, data_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (source_url, business_name, category, phone, email, address, city, country, data_json_str))
-            conn.commit()
-            return cursor.lastrowid
+        data_json_str = _dumps(data_json) if data_json else None
+        return self._enqueue_wait(_SQL_INSERT_SCRAPED,
+                                  (source_url, business_name, category, phone, email, address,
+                                   city, country, data_json_str))
+    
+    def add_scraped_data_bulk(self, rows: List[tuple]) -> int:
+        """Add many scraped-data rows in one executemany transaction
+        
+        Each row is a tuple in _SQL_INSERT_SCRAPED column order:
+        (source_url, business_name, category, phone, email, address,
+        city, country, data_json).
+        """
+        if not rows:
+            return 0
+        self._enqueue_many(_SQL_INSERT_SCRAPED, rows)
+        return len(rows)
     
     def get_scraped_data(self, category: str = None, city: str = None, 
                         country: str = None) -> List[Dict[str, Any]]:
         """Get scraped data with optional filters"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM scraped_data WHERE 1=1"
-            params = []
-            
-            if category:
-                query += " AND category = ?"
-                params.append(category)
-            
-            if city:
-                query += " AND city = ?"
-                params.append(city)
-            
-            if country:
-                query += " AND country = ?"
-                params.append(country)
-            
-            query += " ORDER BY scraped_date DESC"
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        # Read-your-writes: drain pending writes before querying
+        self.flush()
+        cursor = self._get_conn().cursor()
+
+        query = "SELECT * FROM scraped_data WHERE 1=1"
+        params = []
+
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+
+        if city:
+            query += " AND city = ?"
+            params.append(city)
+
+        if country:
+            query += " AND country = ?"
+            params.append(country)
+
+        query += " ORDER BY scraped_date DESC"
+
+        cursor.execute(query, params)
+        return [self._row_to_dict(row, 'data_json') for row in cursor.fetchall()]
     
     def add_scheduled_task(self, task_name: str, task_type: str, schedule_time: str,
                           config: Dict = None) -> int:
         """Add a new scheduled task"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            config_json = json.dumps(config) if config else None
-            cursor.execute("""
-                INSERT INTO scheduled_tasks (task_name, task_type, schedule_time, config_json)
-                VALUES (?, ?, ?, ?)
-            """, (task_name, task_type, schedule_time, config_json))
-            conn.commit()
-            return cursor.lastrowid
+        self._tasks_cache = (0.0, None)
+        config_json = _dumps(config) if config else None
+        return self._enqueue_wait(_SQL_INSERT_TASK,
+                                  (task_name, task_type, schedule_time, config_json))
     
+    def add_scheduled_tasks(self, tasks: List[Dict[str, Any]]) -> int:
+        """Add multiple scheduled tasks in a single transaction"""
+        if not tasks:
+            return 0
+        self._tasks_cache = (0.0, None)
+        self._enqueue_many(_SQL_INSERT_TASK, [
+            (task["task_name"], task["task_type"], task.get("schedule_time"),
+             _dumps(task["config"]) if task.get("config") else None)
+            for task in tasks
+        ])
+        return len(tasks)
+
     def update_task_run_time(self, task_id: int, last_run: datetime, next_run: datetime):
         """Update task run times"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE scheduled_tasks 
-                SET last_run = ?, next_run = ?
-                WHERE id = ?
-            """, (last_run, next_run, task_id))
-            conn.commit()
+        self._tasks_cache = (0.0, None)
+        self._enqueue("""
+            UPDATE scheduled_tasks 
+            SET last_run = ?, next_run = ?
+            WHERE id = ?
+        """, (last_run, next_run, task_id))
+    
+    def get_task_by_name(self, task_name: str) -> Optional[Dict[str, Any]]:
+        """Get one active task by name via an index-backed single-row fetch"""
+        # Read-your-writes: drain pending writes before querying
+        self.flush()
+        cursor = self._get_conn().cursor()
+        cursor.execute("""
+            SELECT * FROM scheduled_tasks
+            WHERE task_name = ? AND status = 'active'
+            LIMIT 1
+        """, (task_name,))
+        row = cursor.fetchone()
+        return self._row_to_dict(row, 'config_json') if row else None
     
     def get_active_scheduled_tasks(self) -> List[Dict[str, Any]]:
-        """Get active scheduled tasks"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM scheduled_tasks 
-                WHERE status = 'active' 
-                ORDER BY next_run ASC
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+        """Get active scheduled tasks
+        
+        Cached for a few seconds: the scheduler asks on every tick but
+        the set only changes when a task is added or its run time moves,
+        both of which invalidate the cache.
+        """
+        timestamp, cached = self._tasks_cache
+        if cached is not None and time.monotonic() - timestamp < self._TASKS_CACHE_TTL:
+            return cached
+        # Read-your-writes: drain pending writes before querying
+        self.flush()
+        cursor = self._get_conn().cursor()
+        cursor.execute("""
+            SELECT * FROM scheduled_tasks
+            WHERE status = 'active'
+            ORDER BY next_run ASC
+        """)
+        tasks = [self._row_to_dict(row, 'config_json') for row in cursor.fetchall()]
+        self._tasks_cache = (time.monotonic(), tasks)
+        return tasks
 
 
 # Global database instance
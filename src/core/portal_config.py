@@ -0,0 +1,32 @@
+"""
+Read-only accessor for the job portal configuration
+"""
+
+import functools
+import os
+import types
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'job_portals.json')
+
+
+@functools.lru_cache(maxsize=4)
+def _parse(path: str, mtime: float):
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def get_portal_config() -> types.MappingProxyType:
+    """Return job_portals.json parsed once per mtime, as a read-only view
+
+    Every agent construction reads this file; the lru_cache keyed on
+    mtime makes repeat reads free, and the MappingProxyType stops a
+    caller from mutating (and silently poisoning) the shared parse.
+    """
+    return types.MappingProxyType(_parse(_CONFIG_PATH, os.path.getmtime(_CONFIG_PATH)))
@@ -175,61 +175,100 @@ def send_email(to_email: str, subject: str, body: str,
         return False
 
 
+class IMAPClient:
+    """IMAP helper that keeps a single connection open across checks"""
+
+    def __init__(self, imap_config: Dict = None):
+        if imap_config is None:
+            imap_config = config.get_email_config()
+        self.imap_config = imap_config
+        self._imap = None
+
+    def _connect(self) -> imaplib.IMAP4_SSL:
+        """Open a fresh IMAP connection and select the inbox"""
+        mail = imaplib.IMAP4_SSL(self.imap_config.get('imap_server', 'localhost'))
+        mail.login(self.imap_config.get('imap_username', ''),
+                   self.imap_config.get('imap_password', ''))
+        mail.select('INBOX')
+        return mail
+
+    def _ensure_connection(self) -> imaplib.IMAP4_SSL:
+        """Reuse the existing connection, reconnecting only if it went stale"""
+        if self._imap is not None:
+            try:
+                self._imap.noop()
+                return self._imap
+            except Exception:
+                self._imap = None
+        self._imap = self._connect()
+        return self._imap
+
+    def check_for_responses(self) -> List[Dict[str, Any]]:
+        """Check the inbox for new job-related responses"""
+        responses = []
+
+        try:
+            mail = self._ensure_connection()
+
+            # Search for unread emails from the last 24 hours
+            date = (datetime.now() - timedelta(days=1)).strftime("%d-%b-%Y")
+            _, messages = mail.search(None, f'(UNSEEN SINCE "{date}")')
+
+            for num in messages[0].split():
+                _, msg_data = mail.fetch(num, '(RFC822)')
+                email_body = msg_data[0][1]
+                email_message = message_from_bytes(email_body)
+
+                # Parse email content
+                subject = email_message.get('Subject', '')
+                sender = email_message.get('From', '')
+
+                # Get email body
+                body = ""
+                if email_message.is_multipart():
+                    for part in email_message.walk():
+                        if part.get_content_type() == "text/plain":
+                            body = part.get_payload(decode=True).decode()
+                            break
+                else:
+                    body = email_message.get_payload(decode=True).decode()
+
+                # Parse content
+                parsed = parse_email_content(f"From: {sender}\nSubject: {subject}\n\n{body}")
+
+                if parsed["job_related"]:
+                    responses.append({
+                        "sender": sender,
+                        "subject": subject,
+                        "body": body,
+                        "response_type": parsed["response_type"],
+                        "received_date": datetime.now()
+                    })
+
+        except Exception as e:
+            logging.error(f"Failed to check email: {e}")
+            self._imap = None
+
+        return responses
+
+    def logout(self):
+        """Close the persistent connection"""
+        if self._imap is not None:
+            try:
+                self._imap.close()
+                self._imap.logout()
+            except Exception:
+                pass
+            self._imap = None
+
+
 def check_email_for_responses(imap_config: Dict = None) -> List[Dict[str, Any]]:
-    """Check email for new responses"""
-    if imap_config is None:
-        imap_config = config.get_email_config()
-    
-    responses = []
-    
+    """Check email for new responses using a one-shot connection"""
+    client = IMAPClient(imap_config)
     try:
-        mail = imaplib.IMAP4_SSL(imap_config.get('imap_server', 'localhost'))
-        mail.login(imap_config.get('imap_username', ''), 
-                  imap_config.get('imap_password', ''))
-        mail.select('INBOX')
-        
-        # Search for unread emails from the last 24 hours
-        date = (datetime.now() - timedelta(days=1)).strftime("%d-%b-%Y")
-        _, messages = mail.search(None, f'(UNSEEN SINCE "{date}")')
-        
-        for num in messages[0].split():
-            _, msg_data = mail.fetch(num, '(RFC822)')
-            email_body = msg_data[0][1]
-            email_message = message_from_bytes(email_body)
-            
-            # Parse email content
-            subject = email_message.get('Subject', '')
-            sender = email_message.get('From', '')
-            
-            # Get email body
-            body = ""
-            if email_message.is_multipart():
-                for part in email_message.walk():
-                    if part.get_content_type() == "text/plain":
-                        body = part.get_payload(decode=True).decode()
-                        break
-            else:
-                body = email_message.get_payload(decode=True).decode()
-            
-            # Parse content
-            parsed = parse_email_content(f"From: {sender}\nSubject: {subject}\n\n{body}")
-            
-            if parsed["job_related"]:
-                responses.append({
-                    "sender": sender,
-                    "subject": subject,
-                    "body": body,
-                    "response_type": parsed["response_type"],
-                    "received_date": datetime.now()
-                })
-        
-        mail.close()
-        mail.logout()
-        
-    except Exception as e:
-        logging.error(f"Failed to check email: {e}")
-    
-    return responses
+        return client.check_for_responses()
+    finally:
+        client.logout()
 
 
 def format_cv_for_job(cv_content: str, job_requirements: str, 